@@ -0,0 +1,104 @@
+"""
+Conditional and compressed JSON API responses
+Adds a strong content ETag (answering If-None-Match with 304) and gzip/brotli encoding above a size threshold
+"""
+
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; gzip is always available
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def content_etag(body):
+    """Strong ETag for an uncompressed body"""
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def choose_encoding(accept_encoding):
+    """Pick br or gzip from an Accept-Encoding header, or None for identity"""
+    accepted = {}
+    for part in (accept_encoding or '').lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    def allowed(name):
+        return accepted.get(name, accepted.get('*', 0.0)) > 0
+
+    if brotli is not None and allowed('br'):
+        return 'br'
+    if allowed('gzip'):
+        return 'gzip'
+    return None
+
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def etag_matches(if_none_match, etag):
+    """Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def finalize_json(response, request, min_size=1024, encoded_cache=None):
+    """Make a JSON GET response conditional and, when large enough, compressed
+
+    Each encoding is a separate representation with its own strong ETag
+    (content hash plus an encoding suffix). encoded_cache, a ResponseCache,
+    keeps compressed bodies by ETag so repeated loads of unchanged data
+    skip recompression.
+    """
+    if response.direct_passthrough or response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+
+    body = response.get_data()
+    encoding = choose_encoding(request.headers.get('Accept-Encoding')) if len(body) >= min_size else None
+    etag = content_etag(body)
+    if encoding:
+        etag = f'{etag}-{encoding}'
+
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+
+    if etag_matches(request.headers.get('If-None-Match'), etag):
+        response.status_code = 304
+        response.set_data(b'')
+        response.headers.pop('Content-Type', None)
+        response.headers.pop('Content-Length', None)
+        return response
+
+    if encoding:
+        encoded = encoded_cache.get(etag) if encoded_cache is not None else None
+        if encoded is None:
+            encoded = compress(body, encoding)
+            if encoded_cache is not None:
+                encoded_cache.set(etag, encoded)
+        response.set_data(encoded)
+        response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,100 @@
+"""
+Typed JSON API responses
+msgspec Structs for the hot read endpoints, encoded straight to bytes without intermediate dicts.
+Fields are declared in alphabetical order so keys come out in the order jsonify (sort_keys) used.
+Bodies are equivalent JSON but not byte-identical: msgspec writes non-ASCII text as raw UTF-8,
+where jsonify escaped it (ensure_ascii, e.g. Caf\\u00e9), so such bodies are smaller and get new ETags.
+"""
+
+from typing import List, Optional
+import msgspec
+
+
+class ArticleOut(msgspec.Struct, gc=False):
+    category: Optional[str]
+    company: str
+    description: str
+    feed_id: int
+    feed_name: str
+    link: str
+    published: str
+    published_estimated: bool
+    title: str
+
+
+class ArticlesPage(msgspec.Struct):
+    articles: List[ArticleOut]
+    next_cursor: Optional[str]
+
+
+class StreamArticleOut(msgspec.Struct, gc=False):
+    category: Optional[str]
+    category_id: Optional[int]
+    company: str
+    description: str
+    feed_id: int
+    feed_name: str
+    id: int
+    link: str
+    published: str
+    published_estimated: bool
+    title: str
+
+
+class FeedOut(msgspec.Struct, gc=False):
+    consecutive_failures: int
+    effective_interval: int
+    enabled: bool
+    id: int
+    last_error: Optional[str]
+    name: str
+    paused_until: Optional[str]
+    refresh_interval: Optional[int]
+    url: str
+
+
+class CategoryFeedsOut(msgspec.Struct):
+    color: Optional[str]
+    feeds: List[FeedOut]
+    id: int
+    name: str
+
+
+class CategoryOut(msgspec.Struct, gc=False):
+    color: Optional[str]
+    description: Optional[str]
+    id: int
+    name: str
+
+
+class UserInfoOut(msgspec.Struct):
+    can_manage_categories: bool
+    can_manage_feeds: bool
+    can_manage_users: bool
+    email: str
+    id: str
+    name: Optional[str]
+    roles: List[str]
+
+
+class UserOut(msgspec.Struct):
+    can_manage_feeds: bool
+    email: str
+    id: str
+    name: Optional[str]
+    role: str  # Frontend expects 'Admin', 'Editor' or 'Viewer'
+    roles: List[str]
+
+
+class UserResponse(msgspec.Struct):
+    user: UserOut
+
+
+def isoformat_utc(value):
+    """Naive UTC datetime as the API's ISO 8601 'Z' string ('' for None)"""
+    return value.isoformat() + 'Z' if value else ''
+
+
+def encode(value):
+    """Encode a Struct (or list of Structs) to JSON bytes"""
+    return msgspec.json.encode(value)
@@ -1,19 +1,31 @@
 import os
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+import math
+import time
+import threading
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, g, stream_with_context
 from flask_session import Session
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from functools import wraps
 import requests
-try:
-    import feedparser
-except ImportError:
-    import rss_parser as feedparser
 from datetime import datetime, timedelta
 import json
 import msal
 import jwt
 from config import Config
+from ingestion import FeedIngestor
+import article_store
+import search_index
+import schema_upgrade
+import pagination
+from response_cache import ResponseCache, SharedResponseCache
+import api_response
+import api_schema
+import metrics
+from principal import Principal, PrincipalCache
+from article_stream import ArticleBroadcaster, query_articles_after, format_event, BATCH_SIZE, LOOKBACK
+from hot_window import HotWindow
+from sqlalchemy.orm import joinedload
 
 # Removed db_retry function - no longer needed with proper IP whitelisting
 
@@ -39,9 +51,49 @@ def create_app():
     Session(app)
     
     # Initialize SQLAlchemy with engine options
-    from models import db, User, Category, Feed, UserRole, Article, Roles
+    from models import db, User, Category, Feed, UserRole, Article, FeedFetchStat, Roles
     db.init_app(app)
     
+    if app.config['METRICS_ENABLED']:
+        engine_options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        with app.app_context():
+            metrics.instrument_pool(db.engine, engine_options.get('pool_size', 5), engine_options.get('max_overflow', 10))
+    
+    # Cache of serialized /api/articles responses, invalidated by ingestion
+    # (shared by the workers on a node when ARTICLES_CACHE_PATH is set)
+    cache_options = dict(
+        ttl=app.config['ARTICLES_CACHE_TTL'],
+        max_entries=app.config['ARTICLES_CACHE_MAX_ENTRIES'],
+        enabled=app.config['ARTICLES_CACHE_ENABLED']
+    )
+    if app.config['ARTICLES_CACHE_PATH']:
+        articles_cache = SharedResponseCache(app.config['ARTICLES_CACHE_PATH'], **cache_options)
+    else:
+        articles_cache = ResponseCache(**cache_options)
+    
+    # Compressed API bodies by ETag, so unchanged data isn't recompressed on every load
+    compressed_cache = ResponseCache(
+        ttl=app.config['ARTICLES_CACHE_TTL'],
+        max_entries=app.config['API_COMPRESSED_CACHE_ENTRIES']
+    )
+    
+    # Newest articles in memory for first pages and the live widget
+    hot_window = HotWindow(
+        max_articles=app.config['HOT_WINDOW_MAX_ARTICLES'],
+        max_bytes=app.config['HOT_WINDOW_MAX_BYTES'],
+        refresh_interval=app.config['HOT_WINDOW_REFRESH_INTERVAL'],
+        reload_interval=app.config['ARTICLES_CACHE_TTL'],
+        enabled=app.config['HOT_WINDOW_ENABLED']
+    )
+    
+    # Pushes newly stored articles to /api/articles/stream clients
+    article_broadcaster = ArticleBroadcaster(app, poll_interval=app.config['ARTICLE_STREAM_POLL_INTERVAL'])
+    # Each open stream holds a worker thread for its lifetime, so only this many run per process
+    stream_slots = threading.BoundedSemaphore(max(1, app.config['ARTICLE_STREAM_MAX_CLIENTS']))
+    
+    # Short-TTL cache of resolved users/roles across requests (invalidated on login sync)
+    principal_cache = PrincipalCache(ttl=app.config['USER_ROLE_CACHE_TTL'])
+    
     # Initialize MSAL app
     msal_app = msal.ConfidentialClientApplication(
         app.config['CLIENT_ID'],
@@ -115,7 +167,27 @@ def create_app():
         print(f"DEBUG: Added {roles_added} roles total")
         
         db.session.commit()
+        principal_cache.invalidate(user_id)
+        g.pop('principal', None)
         return user
+    
+    def get_current_principal():
+        """Resolve the signed-in user and roles once per request (None if not in the database)"""
+        if 'principal' in g:
+            return g.principal
+        
+        principal = None
+        user_id = (session.get('user') or {}).get('oid')
+        if user_id:
+            principal = principal_cache.get(user_id)
+            if principal is None:
+                user = User.query.options(joinedload(User.roles)).filter_by(id=user_id).first()
+                if user:
+                    principal = Principal.from_user(user)
+                    principal_cache.set(principal)
+        
+        g.principal = principal
+        return principal
 
     def get_user_for_template(session_user):
         """Get user object for template rendering with proper role handling"""
@@ -130,18 +202,16 @@ def create_app():
         if not user_id:
             return session_user
             
-        # Fetch the database user object for proper role handling
-        db_user = db.session.get(User, user_id)
+        # Resolve the user and roles for proper role handling
+        principal = get_current_principal()
         
-        if db_user:
-            print(f"DEBUG: Found database user: {db_user.email}")
-            print(f"DEBUG: User roles: {[role.role_name for role in db_user.roles]}")
-            print(f"DEBUG: Can manage feeds: {db_user.can_manage_feeds}")
+        if principal:
+            print(f"DEBUG: Found database user: {principal.email}")
+            print(f"DEBUG: User roles: {principal.get_roles()}")
+            print(f"DEBUG: Can manage feeds: {principal.can_manage_feeds}")
             
             # Add session data as attributes for template compatibility
-            db_user.session_name = session_user.get('name', db_user.name)
-            db_user.session_email = session_user.get('preferred_username', db_user.email)
-            return db_user
+            return principal.for_session(session_user)
         else:
             print(f"DEBUG: Database user not found for ID: {user_id}")
             # If database user not found, create a fallback object with basic admin check
@@ -253,7 +323,7 @@ def create_app():
                 if not user_id:
                     return redirect(url_for('login'))
                 
-                user = db.session.get(User, user_id)
+                user = get_current_principal()
                 if not user or not user.has_role(role_name):
                     flash(f'Access denied. {role_name} role required.', 'error')
                     return redirect(url_for('index'))
@@ -270,15 +340,12 @@ def create_app():
             if not user_id:
                 return redirect(url_for('login'))
             
-            user = db.session.get(User, user_id)
+            user = get_current_principal()
             if not user:
                 return redirect(url_for('login'))
             
             # Check if user has admin or editor role
-            user_roles = user.get_roles()
-            can_manage = any(Roles.can_manage_feeds(role) for role in user_roles)
-            
-            if not can_manage:
+            if not user.can_manage_feeds:
                 flash('You do not have permission to manage feeds.', 'error')
                 return redirect(url_for('index'))
             return f(*args, **kwargs)
@@ -291,10 +358,10 @@ def create_app():
         if user_data:
             user_id = user_data.get('oid')
             if user_id:
-                db_user = db.session.get(User, user_id)
-                if db_user:
-                    user_data['roles'] = db_user.get_roles()
-                    user_data['can_manage_feeds'] = any(Roles.can_manage_feeds(role) for role in user_data['roles'])
+                principal = get_current_principal()
+                if principal:
+                    user_data['roles'] = principal.get_roles()
+                    user_data['can_manage_feeds'] = principal.can_manage_feeds
         return dict(user=user_data)
 
     def init_default_data():
@@ -303,6 +370,13 @@ def create_app():
             try:
                 # Create all tables first
                 db.create_all()
+                upgraded = schema_upgrade.upgrade_schema()
+                if upgraded:
+                    print(f"Schema upgraded: {', '.join(upgraded)}")
+                search_index.ensure_search_index()
+                backfilled = article_store.refresh_derived_fields()
+                if backfilled:
+                    print(f"Derived sort fields filled for {backfilled} articles")
                 print("Database tables created/verified successfully")
                 
                 # Check if categories exist
@@ -483,7 +557,7 @@ def create_app():
             if not user_id:
                 return jsonify({'error': 'Authentication required'}), 401
             
-            user = db.session.get(User, user_id)
+            user = get_current_principal()
             if not user or not user.can_manage_feeds:
                 return jsonify({'error': 'Permission denied. Admin or Editor role required.'}), 403
             
@@ -519,133 +593,296 @@ def create_app():
         result = []
         
         for category in categories:
-            cat_data = {
-                'id': category.id,
-                'name': category.name,
-                'color': category.color,
-                'feeds': []
-            }
-            
+            feeds = []
             for feed in category.feeds:
                 if feed.enabled:
-                    cat_data['feeds'].append({
-                        'id': feed.id,
-                        'name': feed.name,
-                        'url': feed.url,
-                        'enabled': feed.enabled
-                    })
+                    feeds.append(api_schema.FeedOut(
+                        id=feed.id,
+                        name=feed.name,
+                        url=feed.url,
+                        enabled=feed.enabled,
+                        refresh_interval=feed.refresh_interval,
+                        effective_interval=feed.effective_interval,
+                        consecutive_failures=feed.consecutive_failures or 0,
+                        paused_until=feed.breaker_open_until.isoformat() + 'Z' if feed.breaker_open_until else None,
+                        last_error=feed.last_error
+                    ))
+            
+            result.append(api_schema.CategoryFeedsOut(id=category.id, name=category.name, color=category.color, feeds=feeds))
+        
+        return app.response_class(api_schema.encode(result), mimetype='application/json')
+
+    @app.route('/api/feeds/health')
+    @login_required
+    @requires_tbmcg_email
+    def feeds_health():
+        """Per-feed fetch latency percentiles and failure rate over a recent window"""
+        hours = min(max(request.args.get('hours', 24, type=int), 1), 24 * 30)
+        since = datetime.utcnow() - timedelta(hours=hours)
+        
+        def percentile(sorted_values, pct):
+            # Nearest-rank percentile
+            if not sorted_values:
+                return None
+            index = max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1)
+            return round(sorted_values[index], 1)
+        
+        stats_by_feed = {}
+        rows = db.session.query(
+            FeedFetchStat.feed_id, FeedFetchStat.outcome, FeedFetchStat.latency_ms,
+            FeedFetchStat.bytes, FeedFetchStat.http_status, FeedFetchStat.error_class,
+            FeedFetchStat.fetched_at
+        ).filter(FeedFetchStat.fetched_at >= since).order_by(FeedFetchStat.feed_id, FeedFetchStat.fetched_at)
+        for row in rows:
+            stats_by_feed.setdefault(row.feed_id, []).append(row)
+        
+        result = []
+        for feed in Feed.query.order_by(Feed.id).all():
+            fetches = stats_by_feed.get(feed.id, [])
+            latencies = sorted(f.latency_ms for f in fetches if f.latency_ms is not None)
+            sizes = [f.bytes for f in fetches if f.bytes]
+            failures = sum(1 for f in fetches if f.outcome == 'error')
+            last = fetches[-1] if fetches else None
             
-            result.append(cat_data)
+            result.append({
+                'feed_id': feed.id,
+                'name': feed.name,
+                'enabled': feed.enabled,
+                'fetches': len(fetches),
+                'failures': failures,
+                'failure_rate': round(failures / len(fetches), 4) if fetches else None,
+                'not_modified': sum(1 for f in fetches if f.outcome == 'not_modified'),
+                'unchanged': sum(1 for f in fetches if f.outcome == 'unchanged'),
+                'p50_latency_ms': percentile(latencies, 50),
+                'p95_latency_ms': percentile(latencies, 95),
+                'avg_bytes': int(sum(sizes) / len(sizes)) if sizes else None,
+                'last_fetched_at': last.fetched_at.isoformat() + 'Z' if last else None,
+                'last_outcome': last.outcome if last else None,
+                'last_status': last.http_status if last else None,
+                'last_error': last.error_class if last else None,
+                'consecutive_failures': feed.consecutive_failures or 0,
+                'paused_until': feed.breaker_open_until.isoformat() + 'Z' if feed.breaker_open_until else None
+            })
         
-        return jsonify(result)
+        return jsonify({'window_hours': hours, 'feeds': result})
 
     @app.route('/api/articles')
     @login_required
     @requires_tbmcg_email
     def get_articles():
-        """Fetch and return articles from all enabled feeds"""
-        from dateutil import parser as date_parser
-        import time
-        
-        category_id = request.args.get('category_id')
-        sort_by = request.args.get('sort_by', 'date')  # date, company, title
-        sort_order = request.args.get('sort_order', 'desc')  # asc or desc
-        search_query = request.args.get('search', '').lower()
+        """Return stored articles from all enabled feeds
+        
+        Without page_size at most ARTICLES_MAX_RESULTS articles are returned.
+        Passing page_size (and then the returned next_cursor as cursor) pages through
+        the results with keyset pagination; the response is then
+        {'articles': [...], 'next_cursor': token or null}.
+        """
+        category_id = request.args.get('category_id', type=int)
+        sort_by = request.args.get('sort_by', 'date')  # date, company, title, relevance (with search)
+        sort_order = 'asc' if request.args.get('sort_order', 'desc') == 'asc' else 'desc'
+        search_query = ' '.join(request.args.get('search', '').split())
         limit = request.args.get('limit', type=int)  # Optional limit for live feed
+        cursor = request.args.get('cursor')
+        page_size = request.args.get('page_size', type=int)
         
-        if category_id:
-            feeds = Feed.query.filter_by(category_id=category_id, enabled=True).all()
-        else:
-            feeds = Feed.query.filter_by(enabled=True).all()
+        if sort_by not in ('company', 'title', 'relevance') or (sort_by == 'relevance' and not search_query):
+            sort_by = 'date'
+        paginate = cursor is not None or page_size is not None
+        if paginate:
+            page_size = pagination.page_size_from(page_size)
+            limit = page_size + 1  # One extra row tells us whether there is a next page
+        elif app.config['ARTICLES_MAX_RESULTS'] > 0:
+            # Un-paginated responses are capped; the articles table keeps growing
+            limit = min(limit, app.config['ARTICLES_MAX_RESULTS']) if limit and limit > 0 else app.config['ARTICLES_MAX_RESULTS']
+        
+        # Keyed on the parameters as they are applied, so equivalent requests share an entry
+        cache_key = ResponseCache.make_key(category_id, sort_by, sort_order, limit, paginate, cursor,
+                                           search=search_query)
+        cached_body = articles_cache.get(cache_key)
+        if cached_body is not None:
+            return app.response_class(cached_body, mimetype='application/json')
         
-        articles = []
-        for feed in feeds:
+        # The newest articles by date come from the in-memory hot window when it covers the request
+        articles = None
+        if not search_query and sort_by == 'date' and sort_order == 'desc' and limit and limit > 0:
             try:
-                # Update last_updated timestamp
-                feed.last_updated = datetime.utcnow()
-                db.session.commit()
-                
-                parsed_feed = feedparser.parse(feed.url)
-                
-                for entry in parsed_feed.entries[:10]:  # Limit to 10 articles per feed
-                    # Parse and normalize the date
-                    published_str = entry.get('published', entry.get('updated', ''))
-                    published_timestamp = None
-                    
-                    if published_str:
-                        try:
-                            # Parse the date string to a datetime object
-                            published_dt = date_parser.parse(published_str)
-                            published_timestamp = published_dt.timestamp()
-                        except:
-                            # If parsing fails, use current time
-                            published_timestamp = time.time()
-                    else:
-                        published_timestamp = time.time()
-                    
-                    # Extract company from title or feed name
-                    title = entry.get('title', 'No title')
-                    company = ''
-                    
-                    # Try to extract company name from title (common patterns)
-                    if ':' in title:
-                        company = title.split(':')[0].strip()
-                    elif '|' in title:
-                        company = title.split('|')[0].strip()
-                    elif ' - ' in title:
-                        parts = title.split(' - ')
-                        if len(parts) > 1:
-                            company = parts[-1].strip()
-                    
-                    # If no company found in title, use feed name
-                    if not company:
-                        company = feed.name
-                    
-                    article = {
-                        'title': title,
-                        'link': entry.get('link', ''),
-                        'description': entry.get('summary', entry.get('description', '')),
-                        'published': published_str,
-                        'published_timestamp': published_timestamp,
-                        'feed_name': feed.name,
-                        'feed_id': feed.id,
-                        'category': feed.category.name if feed.category else None,
-                        'company': company
-                    }
-                    
-                    # Apply search filter if provided
-                    if search_query:
-                        if (search_query in article['title'].lower() or
-                            search_query in article['description'].lower() or
-                            search_query in article['feed_name'].lower() or
-                            search_query in article['company'].lower()):
-                            articles.append(article)
+                before = pagination.decode_cursor(cursor, 'date', sort_order) if cursor else None
+            except pagination.InvalidCursor as e:
+                return jsonify({'error': str(e)}), 400
+            # A shared-cache miss may follow another worker's ingestion, and the body built
+            # here is shared with every worker, so pick up new articles first
+            articles = hot_window.newest(limit, category_id or None, before,
+                                         refresh=isinstance(articles_cache, SharedResponseCache))
+        
+        if articles is None:
+            query = db.session.query(Article, Feed.name, Category.name) \
+                .join(Feed, Article.feed_id == Feed.id) \
+                .outerjoin(Category, Feed.category_id == Category.id) \
+                .filter(Feed.enabled == True)
+            
+            if category_id:
+                query = query.filter(Feed.category_id == category_id)
+            
+            # Full-text search over title/description plus feed-name matches
+            matches = None
+            if search_query:
+                matches = search_index.match_subquery(search_query)
+                if matches is None:
+                    query = query.filter(search_index.like_filter(search_query))
+                else:
+                    feed_ids = search_index.matching_feed_ids(search_query)
+                    if feed_ids:
+                        query = query.outerjoin(matches, matches.c.article_id == Article.id) \
+                            .filter(db.or_(matches.c.article_id.isnot(None), Article.feed_id.in_(feed_ids)))
                     else:
-                        articles.append(article)
-                        
-            except Exception as e:
-                print(f"Error fetching feed {feed.name}: {e}")
-                continue
+                        query = query.join(matches, matches.c.article_id == Article.id)
+            
+            if sort_by == 'relevance' and matches is None:
+                sort_by = 'date'  # No full-text index to rank by
+            descending = (sort_order == 'desc')
+            
+            cursor_key = None
+            if cursor:
+                try:
+                    cursor_key = pagination.decode_cursor(cursor, sort_by, sort_order)
+                except pagination.InvalidCursor as e:
+                    return jsonify({'error': str(e)}), 400
+            
+            # Sorting, the cursor and the limit all run in the database
+            if sort_by == 'company':
+                # Company, then newest first within a company
+                sort_columns = [Article.company_key, Article.published_at, Article.id]
+                directions = [descending, not descending, descending]
+            elif sort_by == 'title':
+                sort_columns = [Article.title_key, Article.id]
+                directions = [descending, descending]
+            else:
+                sort_columns = [Article.published_at, Article.id]
+                if sort_by == 'relevance':
+                    sort_columns.insert(0, db.func.coalesce(matches.c.rank, 0))
+                directions = [descending] * len(sort_columns)
+            if cursor_key is not None:
+                query = query.filter(pagination.keyset_filter(sort_columns, cursor_key, directions))
+            query = query.add_columns(*sort_columns) \
+                .order_by(*[column.desc() if desc else column.asc() for column, desc in zip(sort_columns, directions)])
+            if limit and limit > 0:
+                query = query.limit(limit)
+            
+            articles = []
+            for row in query.all():
+                article, feed_name, category_name = row[:3]
+                articles.append((tuple(row[3:]), api_schema.ArticleOut(
+                    title=article.title,
+                    link=article.url,
+                    description=article.description or '',
+                    published=api_schema.isoformat_utc(article.published_at),
+                    published_estimated=article.published_estimated,
+                    feed_name=feed_name,
+                    feed_id=article.feed_id,
+                    category=category_name,
+                    company=article.company or feed_name
+                )))
+            
+        if not paginate:
+            payload = [article for _, article in articles]
+        else:
+            next_cursor = None
+            if len(articles) > page_size:
+                articles = articles[:page_size]
+                next_cursor = pagination.encode_cursor(sort_by, sort_order, articles[-1][0])
+            payload = api_schema.ArticlesPage(articles=[article for _, article in articles], next_cursor=next_cursor)
         
-        # Sort articles based on sort_by parameter
-        reverse_order = (sort_order == 'desc')
+        body = api_schema.encode(payload)
+        articles_cache.set(cache_key, body, category_id)
+        return app.response_class(body, mimetype='application/json')
+    
+    @app.route('/api/articles/stream')
+    @login_required
+    @requires_tbmcg_email
+    def stream_articles():
+        """Push newly ingested articles as Server-Sent Events
+
+        Clients resume with the Last-Event-ID header (sent automatically by
+        EventSource) or ?last_event_id=; new clients start at the newest article.
+        Events follow commit order, so ids are not always increasing, and a
+        resume from further back than the in-memory buffer may repeat articles
+        fetched in the last few minutes; clients should dedupe by id.
+        Past ARTICLE_STREAM_MAX_CLIENTS open streams in this process the response
+        is a 503 and the client should poll /api/articles instead.
+        """
+        category_id = request.args.get('category_id', type=int)
+        resume_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        try:
+            resume_id = int(resume_id) if resume_id else None
+        except ValueError:
+            return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+        # Streams follow the broadcaster's buffer in arrival order; a resume picks up after
+        # the last event sent, or backfills from the database if the buffer no longer holds it
+        if resume_id is None:
+            position = article_broadcaster.position()
+            last_id = article_broadcaster.last_id
+        else:
+            position = article_broadcaster.position_of(resume_id)
+            last_id = resume_id
         
-        if sort_by == 'company':
-            articles.sort(key=lambda x: (x.get('company', '').lower(), -x.get('published_timestamp', 0)), reverse=reverse_order)
-        elif sort_by == 'title':
-            articles.sort(key=lambda x: x.get('title', '').lower(), reverse=reverse_order)
-        else:  # Default to date sorting
-            articles.sort(key=lambda x: x.get('published_timestamp', 0), reverse=reverse_order)
+        heartbeat = app.config['ARTICLE_STREAM_HEARTBEAT']
+        deadline = time.monotonic() + app.config['ARTICLE_STREAM_MAX_SECONDS']
         
-        # Apply limit if specified (for live feed widget)
-        if limit and limit > 0:
-            articles = articles[:limit]
+        if not stream_slots.acquire(blocking=False):
+            response = jsonify({'error': 'Too many open article streams; poll /api/articles instead'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(app.config['ARTICLE_STREAM_MAX_SECONDS'])
+            return response
         
-        # Remove the timestamp field before returning (it was just for sorting)
-        for article in articles:
-            article.pop('published_timestamp', None)
+        def generate(position, last_id):
+            # Don't hold a pooled connection for the life of the stream
+            db.session.close()
+            yield f"retry: {heartbeat * 1000}\n\n"
+            sent = set()  # A backfill and the buffer can both hold an article; send it once
+            since = datetime.utcnow() - LOOKBACK
+            while time.monotonic() < deadline:
+                if position is None:
+                    # Further back than the in-memory buffer reaches. The first read also takes
+                    # recently fetched articles, which may have committed below last_id
+                    position = article_broadcaster.position()
+                    events = query_articles_after(last_id, category_id, since=since)
+                    db.session.close()
+                    since = None
+                    if len(events) == BATCH_SIZE:
+                        position = None  # More to backfill
+                else:
+                    events = article_broadcaster.wait(position, heartbeat)
+                    if events is None:
+                        position = None
+                        since = datetime.utcnow() - LOOKBACK
+                        continue
+                    if not events:
+                        yield ": keep-alive\n\n"
+                        continue
+                    position = events[-1]['seq']
+                for event in events:
+                    if event['id'] in sent:
+                        continue
+                    sent.add(event['id'])
+                    last_id = max(last_id, event['id'])
+                    if category_id is None or event['category_id'] == category_id:
+                        yield format_event(event)
         
-        return jsonify(articles)
+        response = app.response_class(stream_with_context(generate(position, last_id)), mimetype='text/event-stream')
+        # The server closes every response, even when the client leaves before the first event
+        response.call_on_close(stream_slots.release)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @app.route('/api/articles/cache-stats')
+    @login_required
+    @requires_tbmcg_email
+    def articles_cache_stats():
+        """Get hit/miss counters for the /api/articles response cache and hot window"""
+        stats = articles_cache.stats()
+        stats['hot_window'] = hot_window.stats()
+        return jsonify(stats)
 
     @app.route('/manage')
     @login_required
@@ -691,7 +928,11 @@ def create_app():
         """Enable/disable a feed"""
         feed = Feed.query.get_or_404(feed_id)
         feed.enabled = not feed.enabled
+        if feed.enabled:
+            feed.reset_breaker()  # Re-enabling retries a paused feed right away
         db.session.commit()
+        articles_cache.clear()
+        hot_window.clear()
         
         return jsonify({'enabled': feed.enabled})
     
@@ -704,6 +945,8 @@ def create_app():
         feed = Feed.query.get_or_404(feed_id)
         db.session.delete(feed)
         db.session.commit()
+        articles_cache.clear()
+        hot_window.clear()
         
         return jsonify({'message': 'Feed deleted successfully'})
     
@@ -713,12 +956,10 @@ def create_app():
     def get_categories():
         """Get all categories"""
         categories = Category.query.all()
-        return jsonify([{
-            'id': cat.id,
-            'name': cat.name,
-            'color': cat.color,
-            'description': cat.description
-        } for cat in categories])
+        return app.response_class(api_schema.encode([
+            api_schema.CategoryOut(id=cat.id, name=cat.name, color=cat.color, description=cat.description)
+            for cat in categories
+        ]), mimetype='application/json')
     
     @app.route('/api/categories', methods=['POST'])
     @login_required
@@ -774,6 +1015,8 @@ def create_app():
             category.description = data['description']
         
         db.session.commit()
+        articles_cache.clear()
+        hot_window.clear()
         
         return jsonify({
             'message': 'Category updated successfully',
@@ -808,6 +1051,7 @@ def create_app():
         feed = Feed.query.get_or_404(feed_id)
         data = request.json
         
+        renamed = 'name' in data and data['name'] != feed.name
         if 'name' in data:
             feed.name = data['name']
         
@@ -816,18 +1060,28 @@ def create_app():
             existing = Feed.query.filter_by(url=data['url']).first()
             if existing and existing.id != feed_id:
                 return jsonify({'error': 'Feed URL already exists'}), 400
+            if data['url'] != feed.url:
+                feed.reset_source()
             feed.url = data['url']
         
         if 'category_id' in data:
             feed.category_id = data['category_id']
         
         if 'enabled' in data:
+            if data['enabled'] and not feed.enabled:
+                feed.reset_breaker()
             feed.enabled = data['enabled']
         
         if 'refresh_interval' in data:
             feed.refresh_interval = data['refresh_interval']
+            feed.adaptive_interval = None  # Relearn starting from the new setting
         
         db.session.commit()
+        if renamed:
+            # Articles without a company in their title fall back to the feed name
+            article_store.refresh_derived_fields(feed.id)
+        articles_cache.clear()
+        hot_window.clear()
         
         return jsonify({
             'message': 'Feed updated successfully',
@@ -844,19 +1098,19 @@ def create_app():
         if not user_id:
             return jsonify({'error': 'Not authenticated'}), 401
         
-        user = db.session.get(User, user_id)
+        user = get_current_principal()
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        return jsonify({
-            'id': user.id,
-            'email': user.email,
-            'name': user.name,
-            'roles': user.get_roles(),
-            'can_manage_feeds': any(Roles.can_manage_feeds(role) for role in user.get_roles()),
-            'can_manage_categories': any(Roles.can_manage_categories(role) for role in user.get_roles()),
-            'can_manage_users': any(Roles.can_manage_users(role) for role in user.get_roles())
-        })
+        return app.response_class(api_schema.encode(api_schema.UserInfoOut(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            roles=user.get_roles(),
+            can_manage_feeds=user.can_manage_feeds,
+            can_manage_categories=user.can_manage_categories,
+            can_manage_users=user.can_manage_users
+        )), mimetype='application/json')
     
     @app.route('/api/user')
     @login_required  
@@ -866,27 +1120,79 @@ def create_app():
         if not user_id:
             return jsonify({'error': 'Not authenticated'}), 401
         
-        user = db.session.get(User, user_id)
+        user = get_current_principal()
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
         user_roles = user.get_roles()
         primary_role = 'Admin' if 'admin' in user_roles else ('Editor' if 'editor' in user_roles else 'Viewer')
         
-        return jsonify({
-            'user': {
-                'id': user.id,
-                'email': user.email,
-                'name': user.name,
-                'role': primary_role,  # Frontend expects this specific format
-                'roles': user_roles,
-                'can_manage_feeds': any(Roles.can_manage_feeds(role) for role in user_roles)
-            }
-        })
+        return app.response_class(api_schema.encode(api_schema.UserResponse(user=api_schema.UserOut(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role=primary_role,
+            roles=user_roles,
+            can_manage_feeds=user.can_manage_feeds
+        ))), mimetype='application/json')
+    
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+    
+    @app.after_request
+    def record_request_metrics(response):
+        """Observe request latency per endpoint (registered first, so it runs after the other hooks)"""
+        started = g.pop('request_started', None)
+        if app.config['METRICS_ENABLED'] and started is not None and request.endpoint not in ('metrics_endpoint', 'stream_articles'):
+            metrics.observe_request(request.endpoint, request.method, response.status_code, time.perf_counter() - started)
+        return response
+    
+    @login_required
+    @requires_tbmcg_email
+    def render_metrics_for_user():
+        body, content_type = metrics.render()
+        return app.response_class(body, content_type=content_type)
+    
+    @app.route('/metrics')
+    def metrics_endpoint():
+        """Prometheus scrape endpoint
+        
+        Scrapers send METRICS_TOKEN as a bearer token; without a token configured
+        the endpoint is limited to signed-in @tbmcg.com users like the rest of the app.
+        """
+        if not app.config['METRICS_ENABLED'] or not metrics.available:
+            return jsonify({'error': 'Metrics are disabled'}), 404
+        token = app.config['METRICS_TOKEN']
+        if not token:
+            return render_metrics_for_user()
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return jsonify({'error': 'Authentication required'}), 401
+        body, content_type = metrics.render()
+        return app.response_class(body, content_type=content_type)
+    
+    @app.after_request
+    def finalize_api_json(response):
+        """Add ETag/304 handling and gzip/brotli encoding to JSON API reads"""
+        if request.method == 'GET' and request.path.startswith('/api/') and response.mimetype == 'application/json':
+            return api_response.finalize_json(
+                response, request,
+                min_size=app.config['API_COMPRESSION_MIN_SIZE'],
+                encoded_cache=compressed_cache
+            )
+        return response
     
     # Initialize default data
     init_default_data()
     
+    # Start background feed ingestion
+    ingestor = FeedIngestor(app)
+    ingestor.add_listener(lambda feed, articles: articles_cache.invalidate_category(feed.category_id))
+    ingestor.add_listener(article_broadcaster.notify)
+    ingestor.add_listener(hot_window.notify)
+    if app.config['INGESTION_ENABLED']:
+        ingestor.start()
+    
     return app
 
 # Create app instance
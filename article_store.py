@@ -0,0 +1,170 @@
+"""
+Bulk article upserts
+Writes a feed's parsed entries in one statement per batch, skipping (feed_id, url) rows that already exist
+"""
+
+from sqlalchemy import insert, select, text, update, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db, Article, Feed
+
+# SQL Server allows at most 2100 parameters per statement; 10 columns per row keeps under it
+BATCH_SIZE = 200
+
+# Sort keys are truncated to fit an indexable column
+SORT_KEY_LENGTH = 255
+
+_COLUMNS = ('feed_id', 'title', 'url', 'description', 'published_at', 'published_estimated', 'fetched_at',
+            'company', 'company_key', 'title_key')
+
+
+def extract_company(title, feed_name):
+    """Extract company name from article title (common patterns), falling back to feed name"""
+    company = ''
+
+    if ':' in title:
+        company = title.split(':')[0].strip()
+    elif '|' in title:
+        company = title.split('|')[0].strip()
+    elif ' - ' in title:
+        parts = title.split(' - ')
+        if len(parts) > 1:
+            company = parts[-1].strip()
+
+    return company or feed_name
+
+
+def sort_key(value):
+    """Case- and whitespace-normalized sort key"""
+    return ' '.join(value.lower().split())[:SORT_KEY_LENGTH]
+
+
+def derived_fields(title, feed_name):
+    """Company and sort keys stored with each article so sorting can use indexes"""
+    company = extract_company(title, feed_name)[:SORT_KEY_LENGTH]
+    return {'company': company, 'company_key': sort_key(company), 'title_key': sort_key(title)}
+
+
+def dedupe_rows(rows):
+    """Drop rows repeating a (feed_id, url) already seen in the batch, keeping the first"""
+    seen = set()
+    unique = []
+    for row in rows:
+        key = (row['feed_id'], row['url'])
+        if row['url'] and key not in seen:
+            seen.add(key)
+            unique.append(row)
+    return unique
+
+
+def upsert_articles(rows):
+    """Insert article rows that aren't stored yet; returns (inserted_rows, skipped_count)
+
+    inserted_rows are the input dicts with their new 'id'. Runs inside the current
+    session transaction; the caller commits.
+    """
+    unique = dedupe_rows(rows)
+    inserted = []
+    for start in range(0, len(unique), BATCH_SIZE):
+        inserted.extend(_upsert_batch(unique[start:start + BATCH_SIZE]))
+    return inserted, len(rows) - len(inserted)
+
+
+def _upsert_batch(rows):
+    if not rows:
+        return []
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        statement = postgresql.insert(Article).values(rows) \
+            .on_conflict_do_nothing(index_elements=['feed_id', 'url'])
+        returned = db.session.execute(statement.returning(Article.id, Article.feed_id, Article.url)).all()
+    elif dialect == 'sqlite':
+        statement = sqlite.insert(Article).values(rows) \
+            .on_conflict_do_nothing(index_elements=['feed_id', 'url'])
+        returned = db.session.execute(statement.returning(Article.id, Article.feed_id, Article.url)).all()
+    elif dialect == 'mssql':
+        returned = _merge_mssql(rows)
+    else:
+        returned = _insert_missing(rows)
+
+    ids = {(feed_id, url): article_id for article_id, feed_id, url in returned}
+    inserted = []
+    for row in rows:
+        key = (row['feed_id'], row['url'])
+        if key in ids:
+            inserted.append(dict(row, id=ids[key]))
+    return inserted
+
+
+def _merge_mssql(rows):
+    """MERGE the batch in one round trip; OUTPUT reports the rows actually inserted"""
+    values = []
+    params = {}
+    for i, row in enumerate(rows):
+        values.append('(' + ', '.join(f':{column}_{i}' for column in _COLUMNS) + ')')
+        for column in _COLUMNS:
+            params[f'{column}_{i}'] = row[column]
+
+    columns = ', '.join(_COLUMNS)
+    statement = text(
+        f"MERGE INTO articles WITH (HOLDLOCK) AS target "
+        f"USING (VALUES {', '.join(values)}) AS source ({columns}) "
+        f"ON target.feed_id = source.feed_id AND target.url = source.url "
+        f"WHEN NOT MATCHED THEN INSERT ({columns}) "
+        f"VALUES ({', '.join('source.' + column for column in _COLUMNS)}) "
+        f"OUTPUT inserted.id, inserted.feed_id, inserted.url;"
+    )
+    return db.session.execute(statement, params).all()
+
+
+def _insert_missing(rows):
+    """Fallback for other databases: look up existing URLs, then executemany the rest"""
+    feed_ids = {row['feed_id'] for row in rows}
+    existing = set(db.session.execute(
+        select(Article.feed_id, Article.url).where(
+            Article.feed_id.in_(feed_ids),
+            Article.url.in_(bindparam('urls', expanding=True))
+        ),
+        {'urls': [row['url'] for row in rows]}
+    ).all())
+
+    missing = [row for row in rows if (row['feed_id'], row['url']) not in existing]
+    if not missing:
+        return []
+    db.session.execute(insert(Article), missing)
+
+    return db.session.execute(
+        select(Article.id, Article.feed_id, Article.url).where(
+            Article.feed_id.in_(feed_ids),
+            Article.url.in_(bindparam('urls', expanding=True))
+        ),
+        {'urls': [row['url'] for row in missing]}
+    ).all()
+
+
+def refresh_derived_fields(feed_id=None, batch_size=500):
+    """Recompute company/sort keys for a feed's articles, or for rows missing them
+
+    Used after a feed is renamed (company falls back to the feed name) and at
+    startup to fill rows stored before the columns existed. Commits per batch.
+    """
+    last_id = 0
+    updated = 0
+    while True:
+        query = select(Article.id, Article.title, Feed.name) \
+            .join(Feed, Article.feed_id == Feed.id) \
+            .where(Article.id > last_id)
+        if feed_id is not None:
+            query = query.where(Article.feed_id == feed_id)
+        else:
+            query = query.where(Article.title_key.is_(None))
+        rows = db.session.execute(query.order_by(Article.id).limit(batch_size)).all()
+        if not rows:
+            return updated
+
+        db.session.execute(update(Article), [
+            dict(derived_fields(title, feed_name), id=article_id) for article_id, title, feed_name in rows
+        ])
+        db.session.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
@@ -0,0 +1,176 @@
+"""
+Server-Sent Events for new articles
+One broadcaster thread per process polls the articles table for rows it hasn't seen yet and fans
+them out to every connected stream, so idle clients cost a blocked thread each and the database
+sees one cheap indexed query per poll no matter how many clients are connected. Ids are allocated
+before commit, so a lower id can become visible after a higher one; each poll re-reads the ids of
+recently fetched articles and streams follow the buffer's arrival order rather than article ids.
+"""
+
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+import api_schema
+from models import db, Article, Feed, Category
+
+# Events kept in memory for clients that briefly fall behind or reconnect
+BUFFER_SIZE = 1000
+# Rows read per poll / per resume backfill
+BATCH_SIZE = 500
+# Articles fetched this recently are re-checked on every poll, catching rows committed late
+LOOKBACK = timedelta(minutes=2)
+
+
+def article_event(article_id, feed_id, category_id, payload):
+    """Bundle a serialized article with the fields streams filter and resume on"""
+    return {'id': article_id, 'feed_id': feed_id, 'category_id': category_id,
+            'data': api_schema.encode(payload).decode('utf-8')}
+
+
+def format_event(event):
+    """Format one article as an SSE message"""
+    return f"id: {event['id']}\nevent: article\ndata: {event['data']}\n\n"
+
+
+def recent_article_ids(after_id, since):
+    """Ids past after_id or fetched since the given time, ascending (an index-only read)"""
+    query = db.session.query(Article.id) \
+        .filter(db.or_(Article.id > after_id, Article.fetched_at >= since)).order_by(Article.id)
+    return [article_id for article_id, in query]
+
+
+def query_articles_after(after_id, category_id=None, limit=BATCH_SIZE, since=None):
+    """Load articles with id > after_id (oldest first) as stream events
+
+    With since, articles fetched at or after that time are included too, so
+    rows committed late below after_id aren't skipped.
+    """
+    condition = Article.id > after_id
+    if since is not None:
+        condition = db.or_(condition, Article.fetched_at >= since)
+    return _query_events(condition, category_id, limit)
+
+
+def query_articles(article_ids):
+    """Load the given articles (oldest first) as stream events"""
+    return _query_events(Article.id.in_(article_ids))
+
+
+def _query_events(condition, category_id=None, limit=None):
+    query = db.session.query(Article, Feed.name, Feed.category_id, Category.name) \
+        .join(Feed, Article.feed_id == Feed.id) \
+        .outerjoin(Category, Feed.category_id == Category.id) \
+        .filter(condition, Feed.enabled == True)
+    if category_id is not None:
+        query = query.filter(Feed.category_id == category_id)
+    query = query.order_by(Article.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    events = []
+    for article, feed_name, feed_category_id, category_name in query:
+        events.append(article_event(article.id, article.feed_id, feed_category_id, api_schema.StreamArticleOut(
+            id=article.id,
+            title=article.title,
+            link=article.url,
+            description=article.description or '',
+            published=api_schema.isoformat_utc(article.published_at),
+            published_estimated=article.published_estimated,
+            feed_name=feed_name,
+            feed_id=article.feed_id,
+            category=category_name,
+            category_id=feed_category_id,
+            company=article.company or feed_name
+        )))
+    return events
+
+
+class ArticleBroadcaster:
+    """Polls for new articles on a background thread and wakes waiting streams"""
+
+    def __init__(self, app, poll_interval=5):
+        self.app = app
+        self.poll_interval = poll_interval
+        self._events = deque(maxlen=BUFFER_SIZE)
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._thread = None
+        self.last_id = None
+        # Ids inside the lookback window that were already buffered (or skipped)
+        self._seen = set()
+        # Buffer positions: each event gets the next sequence number in arrival order
+        self._seq = 0
+        # Events at or below this position may be missing from the buffer
+        self._floor = 0
+
+    def _ensure_started(self):
+        with self._condition:
+            if self._thread is not None:
+                return
+            with self.app.app_context():
+                self.last_id = db.session.query(db.func.max(Article.id)).scalar() or 0
+                self._seen = set(recent_article_ids(self.last_id, datetime.utcnow() - LOOKBACK))
+            self._thread = threading.Thread(target=self._run, name='article-broadcaster', daemon=True)
+            self._thread.start()
+
+    def notify(self, *args):
+        """Poll immediately (used as an ingestion listener in the same process)"""
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    self._poll()
+                except Exception as e:
+                    print(f"Article stream poll failed: {e}")
+                    db.session.rollback()
+
+    def _poll(self):
+        ids = recent_article_ids(self.last_id, datetime.utcnow() - LOOKBACK)
+        fresh = [article_id for article_id in ids if article_id not in self._seen]
+        for start in range(0, len(fresh), BATCH_SIZE):
+            batch = fresh[start:start + BATCH_SIZE]
+            events = query_articles(batch)
+            with self._condition:
+                for event in events:
+                    self._seq += 1
+                    event['seq'] = self._seq
+                    if len(self._events) == self._events.maxlen:
+                        self._floor = self._events[0]['seq']
+                    self._events.append(event)
+                self.last_id = max(self.last_id, batch[-1])
+                self._condition.notify_all()
+            self._seen.update(batch)  # Including disabled feeds' articles, which produce no event
+        # Anything older than the window won't be read again
+        self._seen = set(ids)
+
+    def position(self):
+        """Buffer position of the newest event (new streams start here)"""
+        self._ensure_started()
+        return self._seq
+
+    def position_of(self, article_id):
+        """Buffer position of an article's event, or None if the buffer doesn't hold it"""
+        self._ensure_started()
+        with self._condition:
+            for event in self._events:
+                if event['id'] == article_id:
+                    return event['seq']
+        return None
+
+    def wait(self, position, timeout):
+        """Return buffered events after position, waiting up to timeout seconds for some
+
+        Returns None when position is older than the buffer covers, so the
+        caller must backfill from the database instead.
+        """
+        self._ensure_started()
+        with self._condition:
+            if position < self._floor:
+                return None
+            if self._seq <= position:
+                self._condition.wait(timeout)
+            return [event for event in self._events if event['seq'] > position]
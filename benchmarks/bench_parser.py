@@ -0,0 +1,68 @@
+"""
+RSSParser microbenchmark
+Reports per-item cost of the tree parser and the streaming parser on a generated feed
+
+Usage: python benchmarks/bench_parser.py [items]
+"""
+
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rss_parser import RSSParser
+
+REPEATS = 20
+
+
+def build_feed(item_count):
+    """Build an RSS 2.0 document with realistic item children"""
+    items = []
+    for i in range(item_count):
+        items.append(
+            f'<item><title>Company {i % 50}: headline number {i}</title>'
+            f'<link>https://example.com/articles/{i}</link>'
+            f'<description>&lt;p&gt;Article {i} body with &lt;a href="https://example.com"&gt;a link&lt;/a&gt; '
+            f'and a few more words of summary text.&lt;/p&gt;</description>'
+            f'<pubDate>Mon, 01 Sep 2025 10:{i % 60:02d}:00 GMT</pubDate>'
+            f'<guid>https://example.com/articles/{i}</guid>'
+            f'<category>News</category><category>Business</category>'
+            f'<dc:creator>Staff Writer</dc:creator></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>'
+        '<title>Benchmark feed</title><link>https://example.com</link><description>Generated</description>'
+        + ''.join(items) + '</channel></rss>'
+    ).encode('utf-8')
+
+
+def best_of(func):
+    """Return the fastest of REPEATS runs in seconds"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    document = build_feed(item_count)
+    items = ET.fromstring(document).find('channel').findall('item')
+
+    extract = best_of(lambda: [RSSParser._parse_rss_item(item) for item in items])
+    tree = best_of(lambda: RSSParser.parse_string(document))
+    stream = best_of(lambda: list(RSSParser.iter_entries(document, 10)))
+
+    print(f"{item_count} items, {len(document) / 1024:.0f} KB")
+    print(f"field extraction: {extract / item_count * 1e6:8.2f} us/item")
+    print(f"parse_string:     {tree * 1000:8.2f} ms total")
+    print(f"iter_entries(10): {stream * 1000:8.2f} ms total")
+
+
+if __name__ == '__main__':
+    main()
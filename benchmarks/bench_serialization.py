@@ -0,0 +1,102 @@
+"""
+Articles API serialization microbenchmark
+Compares building dicts + Flask's JSON provider (the jsonify path) with msgspec Structs from api_schema
+
+Usage: python benchmarks/bench_serialization.py [articles]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+import api_schema
+
+REPEATS = 20
+
+
+class Row:
+    """Stand-in for the Article ORM row read by get_articles"""
+
+    def __init__(self, i):
+        self.title = f'Company {i % 50}: headline number {i} about something newsworthy at the Café'
+        self.url = f'https://example.com/articles/{i}'
+        self.description = f'Article {i} summary with a few sentences of text. ' * 3
+        self.published_at = datetime(2025, 9, 1) + timedelta(minutes=i)
+        self.published_estimated = False
+        self.feed_id = i % 40
+        self.company = f'Company {i % 50}'
+
+
+def dict_path(app, rows):
+    # Compact separators, as jsonify uses outside debug mode
+    return app.json.dumps([{
+        'title': row.title,
+        'link': row.url,
+        'description': row.description or '',
+        'published': row.published_at.isoformat() + 'Z' if row.published_at else '',
+        'published_estimated': row.published_estimated,
+        'feed_name': 'Feed',
+        'feed_id': row.feed_id,
+        'category': 'Technology',
+        'company': row.company or 'Feed'
+    } for row in rows], separators=(',', ':'))
+
+
+def struct_path(rows):
+    return api_schema.encode([api_schema.ArticleOut(
+        title=row.title,
+        link=row.url,
+        description=row.description or '',
+        published=api_schema.isoformat_utc(row.published_at),
+        published_estimated=row.published_estimated,
+        feed_name='Feed',
+        feed_id=row.feed_id,
+        category='Technology',
+        company=row.company or 'Feed'
+    ) for row in rows])
+
+
+def best_of(func):
+    """Return the fastest of REPEATS runs in seconds"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    """Peak bytes allocated while func runs"""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = Flask(__name__)
+    rows = [Row(i) for i in range(count)]
+
+    with app.app_context():
+        dict_body = dict_path(app, rows)
+        dict_time = best_of(lambda: dict_path(app, rows))
+        dict_peak = peak_memory(lambda: dict_path(app, rows))
+    struct_body = struct_path(rows)
+    struct_time = best_of(lambda: struct_path(rows))
+    struct_peak = peak_memory(lambda: struct_path(rows))
+
+    print(f"{count} articles, {len(dict_body) / 1024:.0f} KB (jsonify) / {len(struct_body) / 1024:.0f} KB (msgspec)")
+    print(f"dicts + jsonify:  {dict_time * 1000:8.2f} ms, peak {dict_peak / 1024:8.0f} KB")
+    print(f"msgspec Structs:  {struct_time * 1000:8.2f} ms, peak {struct_peak / 1024:8.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Feed timestamp microbenchmark
+Compares dateutil with the timestamps fast paths and the memoized parse_timestamp
+
+Usage: python benchmarks/bench_timestamps.py [count]
+"""
+
+import os
+import sys
+import time
+from datetime import timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dateutil import parser as date_parser
+from timestamps import parse_timestamp
+
+REPEATS = 5
+
+
+def build_dates(count):
+    """Distinct RFC 822 and RFC 3339 strings, half of each"""
+    dates = []
+    for i in range(count):
+        if i % 2:
+            dates.append(f'Mon, {i % 28 + 1:02d} Sep 2025 {i % 24:02d}:{i % 60:02d}:00 +0000')
+        else:
+            dates.append(f'2025-09-{i % 28 + 1:02d}T{i % 24:02d}:{i % 60:02d}:{i % 59:02d}Z')
+    return dates
+
+
+def dateutil_parse(value):
+    parsed = date_parser.parse(value)
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def best_of(func):
+    """Return the fastest of REPEATS runs in seconds"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    dates = build_dates(count)
+
+    reference = best_of(lambda: [dateutil_parse(value) for value in dates])
+
+    def cold():
+        parse_timestamp.cache_clear()
+        [parse_timestamp(value) for value in dates]
+    fast = best_of(cold)
+    memoized = best_of(lambda: [parse_timestamp(value) for value in dates])
+
+    print(f"{count} dates")
+    print(f"dateutil:        {reference / count * 1e6:8.2f} us/date")
+    print(f"fast path:       {fast / count * 1e6:8.2f} us/date")
+    print(f"memoized repeat: {memoized / count * 1e6:8.2f} us/date")
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,9 @@ class Config:
     REDIRECT_PATH = '/auth/callback'  # OAuth callback endpoint
     SCOPE = ['User.ReadBasic.All']  # Microsoft Graph permissions
     
+    # Seconds a resolved user and roles are reused across requests (0 disables)
+    USER_ROLE_CACHE_TTL = int(os.environ.get('USER_ROLE_CACHE_TTL', 30))
+    
     # Domain whitelist for access control
     ALLOWED_DOMAINS = ['tbmcg.com']
     
@@ -43,5 +46,57 @@ class Config:
         }
     }
     
+    # Background feed ingestion
+    INGESTION_ENABLED = os.environ.get('INGESTION_ENABLED', 'true').lower() == 'true'
+    INGESTION_POLL_INTERVAL = int(os.environ.get('INGESTION_POLL_INTERVAL', 60))  # Seconds between checks for due feeds
+    INGESTION_MAX_ENTRIES = int(os.environ.get('INGESTION_MAX_ENTRIES', 10))  # Entries stored per feed fetch
+    FEED_FETCH_CONCURRENCY = int(os.environ.get('FEED_FETCH_CONCURRENCY', 8))  # Feeds fetched in parallel per pass
+    FEED_LEASE_SECONDS = int(os.environ.get('FEED_LEASE_SECONDS', 300))  # A crashed process's feed claims free up after this
+    ADAPTIVE_REFRESH_ENABLED = os.environ.get('ADAPTIVE_REFRESH_ENABLED', 'true').lower() == 'true'  # Learn intervals from publish cadence
+    FEED_MIN_REFRESH_INTERVAL = int(os.environ.get('FEED_MIN_REFRESH_INTERVAL', 5))  # Minutes; bounds for learned intervals
+    FEED_MAX_REFRESH_INTERVAL = int(os.environ.get('FEED_MAX_REFRESH_INTERVAL', 24 * 60))
+    FEED_BREAKER_THRESHOLD = int(os.environ.get('FEED_BREAKER_THRESHOLD', 3))  # Consecutive failures before a feed is paused
+    HOST_BREAKER_THRESHOLD = int(os.environ.get('HOST_BREAKER_THRESHOLD', 5))  # Consecutive failures across a host's feeds
+    FEED_BACKOFF_BASE = int(os.environ.get('FEED_BACKOFF_BASE', 15))  # Minutes paused when a breaker first opens, doubled per failure
+    FEED_BACKOFF_MAX = int(os.environ.get('FEED_BACKOFF_MAX', 24 * 60))  # Minutes
+    FETCH_STATS_FLUSH_SIZE = int(os.environ.get('FETCH_STATS_FLUSH_SIZE', 50))  # Buffered telemetry rows per write
+    FETCH_STATS_RETENTION_DAYS = int(os.environ.get('FETCH_STATS_RETENTION_DAYS', 14))
+    ARTICLE_RETENTION_DAYS = int(os.environ.get('ARTICLE_RETENTION_DAYS', 90))  # By first-seen time; 0 keeps articles forever
+    
+    # /api/articles response cache
+    ARTICLES_CACHE_ENABLED = os.environ.get('ARTICLES_CACHE_ENABLED', 'true').lower() == 'true'
+    ARTICLES_CACHE_TTL = int(os.environ.get('ARTICLES_CACHE_TTL', 60))  # Seconds
+    ARTICLES_CACHE_MAX_ENTRIES = int(os.environ.get('ARTICLES_CACHE_MAX_ENTRIES', 256))
+    ARTICLES_MAX_RESULTS = int(os.environ.get('ARTICLES_MAX_RESULTS', 500))  # Cap on un-paginated responses
+    ARTICLES_CACHE_PATH = os.environ.get('ARTICLES_CACHE_PATH')  # SQLite file shared by a node's workers; unset keeps it per process
+    
+    # In-process window of the newest articles, serving date-sorted first pages and the live widget
+    HOT_WINDOW_ENABLED = os.environ.get('HOT_WINDOW_ENABLED', 'true').lower() == 'true'
+    HOT_WINDOW_MAX_ARTICLES = int(os.environ.get('HOT_WINDOW_MAX_ARTICLES', 2000))
+    HOT_WINDOW_MAX_BYTES = int(os.environ.get('HOT_WINDOW_MAX_BYTES', 16 * 1024 * 1024))  # Oldest articles are evicted past this
+    HOT_WINDOW_REFRESH_INTERVAL = float(os.environ.get('HOT_WINDOW_REFRESH_INTERVAL', 1))  # Seconds between checks for new articles
+    
+    # Prometheus /metrics (set PROMETHEUS_MULTIPROC_DIR under gunicorn to aggregate workers)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token for scrapes; without it /metrics requires a login
+    
+    # JSON API responses: strong ETags (If-None-Match -> 304) and gzip/brotli encoding
+    API_COMPRESSION_MIN_SIZE = int(os.environ.get('API_COMPRESSION_MIN_SIZE', 1024))  # Bytes; smaller bodies are sent as-is
+    API_COMPRESSED_CACHE_ENTRIES = int(os.environ.get('API_COMPRESSED_CACHE_ENTRIES', 64))  # Compressed bodies kept per process
+    
+    # /api/articles/stream (Server-Sent Events)
+    ARTICLE_STREAM_POLL_INTERVAL = float(os.environ.get('ARTICLE_STREAM_POLL_INTERVAL', 5))  # Seconds between checks for new articles
+    ARTICLE_STREAM_HEARTBEAT = int(os.environ.get('ARTICLE_STREAM_HEARTBEAT', 15))  # Seconds between keep-alive comments
+    ARTICLE_STREAM_MAX_SECONDS = int(os.environ.get('ARTICLE_STREAM_MAX_SECONDS', 900))  # Streams close after this; clients reconnect
+    ARTICLE_STREAM_MAX_CLIENTS = int(os.environ.get('ARTICLE_STREAM_MAX_CLIENTS', 8))  # Per worker; keep well below gunicorn --threads
+    
+    # Feed HTTP client (shared keep-alive session per process)
+    FEED_HTTP_POOL_CONNECTIONS = int(os.environ.get('FEED_HTTP_POOL_CONNECTIONS', 20))  # Hosts with pooled connections
+    FEED_HTTP_POOL_MAXSIZE = int(os.environ.get('FEED_HTTP_POOL_MAXSIZE', 10))  # Connections kept per host
+    FEED_HTTP_CONNECT_TIMEOUT = float(os.environ.get('FEED_HTTP_CONNECT_TIMEOUT', 5))  # Seconds
+    FEED_HTTP_READ_TIMEOUT = float(os.environ.get('FEED_HTTP_READ_TIMEOUT', 10))  # Seconds
+    FEED_MAX_BYTES = int(os.environ.get('FEED_MAX_BYTES', 5 * 1024 * 1024))  # Larger feed bodies are abandoned mid-download
+    FEED_HTTP_USER_AGENT = os.environ.get('FEED_HTTP_USER_AGENT', 'TBMCG-News-Dashboard/1.0 (+https://tbmcg-news-dashboard.onrender.com)')
+    
     # Frontend URL for redirects (Render URL in production)
     FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:5000')
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Feed fetch leases
+Atomic, expiring claims on feeds so each due feed is fetched by exactly one process across workers and replicas
+"""
+
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, or_
+from sqlalchemy.exc import IntegrityError
+from models import db, FeedLease
+
+
+def process_holder():
+    """Identify this process in lease rows (host:pid)"""
+    return f'{socket.gethostname()}:{os.getpid()}'[:255]
+
+
+def _ensure_rows(feed_ids):
+    """Create missing lease rows; a concurrent insert of the same row is harmless"""
+    existing = set(db.session.scalars(select(FeedLease.feed_id).where(FeedLease.feed_id.in_(feed_ids))))
+    missing = [feed_id for feed_id in feed_ids if feed_id not in existing]
+    if not missing:
+        return
+    try:
+        db.session.add_all(FeedLease(feed_id=feed_id) for feed_id in missing)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        for feed_id in missing:
+            try:
+                db.session.add(FeedLease(feed_id=feed_id))
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+
+
+def _held(token):
+    return set(db.session.scalars(select(FeedLease.feed_id).where(FeedLease.claim_token == token)))
+
+
+def claim(feed_ids, holder, ttl_seconds, now=None):
+    """Claim every feed in feed_ids whose lease is free or expired; returns (token, claimed_ids)
+
+    The claim is a single conditional UPDATE, so when processes race for the
+    same feed the database lets exactly one of them set its token. Leases of
+    a process that died simply expire after ttl_seconds.
+    """
+    token = uuid.uuid4().hex
+    if not feed_ids:
+        return token, set()
+    now = now or datetime.utcnow()
+    _ensure_rows(feed_ids)
+    db.session.execute(
+        update(FeedLease)
+        .where(FeedLease.feed_id.in_(feed_ids),
+               or_(FeedLease.expires_at.is_(None), FeedLease.expires_at <= now))
+        .values(holder=holder, claim_token=token, claimed_at=now, expires_at=now + timedelta(seconds=ttl_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return token, _held(token)
+
+
+def renew(token, ttl_seconds, now=None):
+    """Extend the leases still held under token; returns the feed ids still held
+
+    A lease that expired is still ours as long as no other process has claimed
+    it, because every claim overwrites the token.
+    """
+    now = now or datetime.utcnow()
+    db.session.execute(
+        update(FeedLease)
+        .where(FeedLease.claim_token == token)
+        .values(expires_at=now + timedelta(seconds=ttl_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return _held(token)
+
+
+def release(token, feed_ids=None):
+    """Give back leases held under token (all of them, or just feed_ids)"""
+    statement = update(FeedLease).where(FeedLease.claim_token == token)
+    if feed_ids is not None:
+        statement = statement.where(FeedLease.feed_id.in_(feed_ids))
+    db.session.execute(
+        statement.values(holder=None, claim_token=None, claimed_at=None, expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
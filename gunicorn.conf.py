@@ -0,0 +1,29 @@
+"""
+Gunicorn hooks (gunicorn loads ./gunicorn.conf.py automatically)
+Keeps the Prometheus multiprocess directory in step with the worker processes and
+starts the shared articles cache empty
+"""
+
+import os
+import shutil
+
+
+def on_starting(server):
+    """Drop metric files and cached responses left over from a previous run"""
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+    cache_path = os.environ.get('ARTICLES_CACHE_PATH')
+    if cache_path:
+        for path in (cache_path, cache_path + '-wal', cache_path + '-shm'):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def child_exit(server, worker):
+    """Stop counting a dead worker's live gauges"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
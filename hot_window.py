@@ -0,0 +1,265 @@
+"""
+Recent-articles hot window
+The newest articles across enabled feeds, held per process so the dashboard's first pages and the
+live widget are answered without sorting the articles table. Articles are stored as column arrays
+sorted by (published, id); feed and category names live once in a lookup table keyed by feed id.
+An article cap and a byte budget evict the oldest first. Refreshes re-check recently fetched ids
+as the article stream does, so rows committed after a higher id are still added.
+"""
+
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+import api_schema
+from article_stream import LOOKBACK, recent_article_ids
+from models import db, Article, Feed, Category
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# Rows read per incremental refresh query
+BATCH_SIZE = 500
+# Array slots, list pointers and the size column held per article besides its strings
+ENTRY_OVERHEAD = 3 * 8 + 1 + 4 * 8 + 8
+
+
+def to_micros(value):
+    """Naive UTC datetime as integer microseconds since the epoch (None sorts oldest)"""
+    return (value - EPOCH) // MICROSECOND if value else 0
+
+
+def from_micros(value):
+    return EPOCH + timedelta(microseconds=value) if value else None
+
+
+class HotWindow:
+    """Thread-safe window of the newest articles, kept in published order
+
+    The window always holds every enabled article newer than its oldest
+    entry, so a read that finds enough matching articles is exact; otherwise
+    the caller falls back to the database.
+    """
+
+    def __init__(self, max_articles=2000, max_bytes=16 * 1024 * 1024, refresh_interval=1.0,
+                 reload_interval=60, enabled=True):
+        self.max_articles = max_articles
+        self.max_bytes = max_bytes
+        self.refresh_interval = refresh_interval
+        # Feed and category edits made in other processes show up after a full reload
+        self.reload_interval = reload_interval
+        self.enabled = enabled and max_articles > 0 and max_bytes > 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._stale = True
+        self._refreshed_at = 0.0
+        self._loaded_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._reset()
+
+    def _reset(self):
+        self._published = array('q')
+        self._ids = array('q')
+        self._feed_ids = array('q')
+        self._sizes = array('q')
+        self._estimated = array('b')  # published is the first-seen time
+        self._titles = []
+        self._urls = []
+        self._descriptions = []
+        self._companies = []  # None when the company is the feed name
+        self._feeds = {}  # feed id -> (feed name, category id, category name)
+        self._bytes = 0
+        self._last_id = 0
+        # Ids inside the refresh lookback that were already read
+        self._seen = set()
+        # True while the window holds every enabled article
+        self._complete = False
+        # (published, id) of the newest evicted article; anything at or below it may be missing
+        self._floor = None
+
+    def notify(self, *args):
+        """Refresh on the next read (used as an ingestion listener in the same process)"""
+        self._stale = True
+
+    def clear(self):
+        """Drop everything and reload on the next read (e.g. after feeds or categories change)"""
+        with self._lock:
+            self._reset()
+            self._loaded = False
+
+    def _remember_feed(self, feed_id, feed_name, category_id, category_name):
+        feed = self._feeds.get(feed_id)
+        if feed is None or feed[0] != feed_name:
+            feed = (sys.intern(feed_name), category_id, sys.intern(category_name) if category_name else None)
+            self._feeds[feed_id] = feed
+        return feed
+
+    def _query(self):
+        return db.session.query(
+            Article.id, Article.published_at, Article.published_estimated, Article.feed_id, Article.title,
+            Article.url, Article.description, Article.company, Feed.name, Feed.category_id, Category.name
+        ).join(Feed, Article.feed_id == Feed.id) \
+            .outerjoin(Category, Feed.category_id == Category.id) \
+            .filter(Feed.enabled == True)
+
+    def _add(self, row):
+        (article_id, published_at, estimated, feed_id, title, url, description, company,
+         feed_name, category_id, category_name) = row
+        feed_name = self._remember_feed(feed_id, feed_name, category_id, category_name)[0]
+        published = to_micros(published_at)
+
+        key = (published, article_id)
+        if (self._floor is not None and key <= self._floor) or \
+                (len(self._ids) >= self.max_articles and key < (self._published[0], self._ids[0])):
+            self._complete = False  # Older than articles already dropped, so it can't be kept in order
+            return
+
+        description = description or ''
+        company = None if not company or company == feed_name else sys.intern(company)
+        size = ENTRY_OVERHEAD + sys.getsizeof(title) + sys.getsizeof(url) + sys.getsizeof(description)
+        if company is not None:
+            size += sys.getsizeof(company)
+
+        # Binary search on the published column, then past equal timestamps with larger ids
+        index = bisect_right(self._published, published)
+        while index > 0 and self._published[index - 1] == published and self._ids[index - 1] > article_id:
+            index -= 1
+        if index > 0 and self._published[index - 1] == published and self._ids[index - 1] == article_id:
+            return  # Already held (read by a load and again by the refresh lookback)
+        self._published.insert(index, published)
+        self._ids.insert(index, article_id)
+        self._feed_ids.insert(index, feed_id)
+        self._sizes.insert(index, size)
+        self._estimated.insert(index, bool(estimated))
+        self._titles.insert(index, title)
+        self._urls.insert(index, url)
+        self._descriptions.insert(index, description)
+        self._companies.insert(index, company)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        """Drop the oldest articles past the article cap or byte budget in one slice"""
+        count = max(len(self._ids) - self.max_articles, 0)
+        freed = sum(self._sizes[:count])
+        while self._bytes - freed > self.max_bytes and count < len(self._ids):
+            freed += self._sizes[count]
+            count += 1
+        if not count:
+            return
+        floor = (self._published[count - 1], self._ids[count - 1])
+        if self._floor is None or floor > self._floor:
+            self._floor = floor
+        for column in (self._published, self._ids, self._feed_ids, self._sizes, self._estimated,
+                       self._titles, self._urls, self._descriptions, self._companies):
+            del column[:count]
+        self._bytes -= freed
+        self.evictions += count
+        self._complete = False
+
+    def _load(self):
+        self._reset()
+        self._last_id = db.session.query(db.func.max(Article.id)).scalar() or 0
+        self._seen = set(recent_article_ids(self._last_id, datetime.utcnow() - LOOKBACK))
+        rows = self._query().filter(Article.id <= self._last_id) \
+            .order_by(Article.published_at.desc(), Article.id.desc()) \
+            .limit(self.max_articles).all()
+        for row in reversed(rows):
+            self._add(row)
+        self._complete = len(rows) < self.max_articles and len(self._ids) == len(rows)
+        self._loaded = True
+
+    def _refresh(self):
+        """Add articles stored since the last load or refresh, including lower ids committed late"""
+        ids = recent_article_ids(self._last_id, datetime.utcnow() - LOOKBACK)
+        fresh = [article_id for article_id in ids if article_id not in self._seen]
+        for start in range(0, len(fresh), BATCH_SIZE):
+            batch = fresh[start:start + BATCH_SIZE]
+            for row in self._query().filter(Article.id.in_(batch)).order_by(Article.id):
+                self._add(row)
+            self._last_id = max(self._last_id, batch[-1])
+            self._seen.update(batch)
+        # Anything older than the window won't be read again; the periodic reload covers later stragglers
+        self._seen = set(ids)
+
+    def _sync(self, refresh=False):
+        now = time.monotonic()
+        if not self._loaded or now - self._loaded_at >= self.reload_interval:
+            self._load()
+            self._loaded_at = now
+        elif refresh or self._stale or now - self._refreshed_at >= self.refresh_interval:
+            self._stale = False
+            self._refresh()
+        else:
+            return
+        self._refreshed_at = now
+
+    def _article(self, index):
+        feed_name, category_id, category_name = self._feeds[self._feed_ids[index]]
+        return api_schema.ArticleOut(
+            title=self._titles[index],
+            link=self._urls[index],
+            description=self._descriptions[index],
+            published=api_schema.isoformat_utc(from_micros(self._published[index])),
+            published_estimated=bool(self._estimated[index]),
+            feed_name=feed_name,
+            feed_id=self._feed_ids[index],
+            category=category_name,
+            company=self._companies[index] or feed_name
+        )
+
+    def newest(self, count, category_id=None, before=None, refresh=False):
+        """Return up to count (sort key, ArticleOut) pairs, newest first, or None if the window can't tell
+
+        before is a (published_at, id) key from a date-descending cursor; sort
+        keys match the database path's so cursors work across both. refresh
+        checks for new articles first even within refresh_interval.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            try:
+                self._sync(refresh)
+            except Exception as e:
+                print(f"Hot window refresh failed: {e}")
+                db.session.rollback()
+                self._loaded = False
+                return None
+            end = len(self._ids)
+            if before is not None:
+                published, article_id = to_micros(before[0]), before[1]
+                end = bisect_left(self._published, published)
+                while end < len(self._ids) and self._published[end] == published and self._ids[end] < article_id:
+                    end += 1
+
+            result = []
+            for index in range(end - 1, -1, -1):
+                if category_id is not None and self._feeds[self._feed_ids[index]][1] != category_id:
+                    continue
+                key = (from_micros(self._published[index]), self._ids[index])
+                result.append((key, self._article(index)))
+                if len(result) == count:
+                    break
+
+            if len(result) < count and not self._complete:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'articles': len(self._ids),
+                'bytes': self._bytes,
+                'max_articles': self.max_articles,
+                'max_bytes': self.max_bytes,
+                'complete': self._complete,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
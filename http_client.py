@@ -0,0 +1,76 @@
+"""
+Shared HTTP client for feed fetching
+One pooled, keep-alive requests.Session per process so repeated fetches reuse connections
+"""
+
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+_session = None
+_session_lock = threading.Lock()
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    """Raised when a response body exceeds the configured byte limit"""
+
+
+def _build_session():
+    """Create a session with per-host connection pools and feed-friendly default headers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=Config.FEED_HTTP_POOL_CONNECTIONS,
+        pool_maxsize=Config.FEED_HTTP_POOL_MAXSIZE
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': Config.FEED_HTTP_USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+        'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.8',
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session():
+    """Get the per-process shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url, **kwargs):
+    """GET a URL through the shared session with the configured (connect, read) timeouts"""
+    kwargs.setdefault('timeout', (Config.FEED_HTTP_CONNECT_TIMEOUT, Config.FEED_HTTP_READ_TIMEOUT))
+    return get_session().get(url, **kwargs)
+
+
+def fetch_bytes(url, max_bytes=None, **kwargs):
+    """GET a URL, streaming the body into bytes; returns (response, body)
+
+    Aborts with ResponseTooLarge as soon as the (decompressed) body passes
+    max_bytes (default FEED_MAX_BYTES), before reading the rest. The body is
+    left undecoded so the XML parser can apply the document's own encoding.
+    """
+    max_bytes = max_bytes or Config.FEED_MAX_BYTES
+    response = get(url, stream=True, **kwargs)
+    try:
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise ResponseTooLarge(f'{url} declares {declared} bytes (limit {max_bytes})', response=response)
+
+        body = bytearray()
+        for chunk in response.iter_content(CHUNK_SIZE):
+            body += chunk
+            if len(body) > max_bytes:
+                raise ResponseTooLarge(f'{url} exceeded {max_bytes} bytes', response=response)
+        return response, bytes(body)
+    finally:
+        response.close()
@@ -0,0 +1,403 @@
+"""
+Background feed ingestion
+Fetches each enabled feed on its own refresh_interval and stores new entries in the articles table
+"""
+
+import hashlib
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+try:
+    import feedparser
+except ImportError:
+    import rss_parser as feedparser
+
+import feed_lease
+import http_client
+import metrics
+from models import db, Article, Feed, FeedFetchStat
+from article_store import upsert_articles, derived_fields
+from rss_parser import RSSParser
+from timestamps import parse_timestamp
+
+
+def backoff_delay(failures, threshold, base, maximum):
+    """Cooldown once a breaker opens: base doubled per further failure, capped, with equal jitter"""
+    delay = min(base * 2 ** max(failures - threshold, 0), maximum)
+    return timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))
+
+
+def adapt_interval(current, published_times, found_new, minimum, maximum, now=None):
+    """Next fetch interval in minutes, learned from fetch yield and publish cadence
+
+    Yield: fetches that find new items pull the interval in, empty fetches push
+    it out. Cadence only counts when the fetch found something new: half the
+    median non-zero gap between the feed's entry timestamps (so a new item
+    waits on average a quarter of its publishing gap), but never less than
+    half the time since the newest entry. The two are averaged and clamped
+    to [minimum, maximum].
+    """
+    estimate = current * (0.75 if found_new else 1.5)
+    times = sorted(published_times)
+    gaps = sorted(gap for gap in ((later - earlier).total_seconds() / 60 for earlier, later in zip(times, times[1:]))
+                  if gap > 0)
+    if found_new and gaps:
+        cadence = gaps[len(gaps) // 2]
+        if now is not None:
+            cadence = max(cadence, (now - times[-1]).total_seconds() / 60)
+        estimate = (estimate + cadence / 2) / 2
+    return int(round(min(max(estimate, minimum), maximum)))
+
+
+class FeedIngestor:
+    """Fetches due feeds on a background thread and upserts their entries into Article"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self.stats = {'fetched': 0, 'not_modified': 0, 'unchanged': 0, 'errors': 0, 'inserted': 0, 'skipped': 0, 'unparsed_dates': 0}
+        self._listeners = []
+        self._fetch_stats = []  # Buffered FeedFetchStat rows, written in batches
+        self._hosts = {}  # host -> [consecutive failures, breaker open until]
+        self._hosts_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.poll_interval = app.config['INGESTION_POLL_INTERVAL']
+        self.max_entries = app.config['INGESTION_MAX_ENTRIES']
+        self.fetch_concurrency = max(1, app.config['FEED_FETCH_CONCURRENCY'])
+        self.stats_flush_size = max(1, app.config['FETCH_STATS_FLUSH_SIZE'])
+        self.stats_retention = timedelta(days=app.config['FETCH_STATS_RETENTION_DAYS'])
+        self.article_retention_days = app.config['ARTICLE_RETENTION_DAYS']
+        self.breaker_threshold = max(1, app.config['FEED_BREAKER_THRESHOLD'])
+        self.host_breaker_threshold = max(1, app.config['HOST_BREAKER_THRESHOLD'])
+        self.backoff_base = app.config['FEED_BACKOFF_BASE'] * 60
+        self.backoff_max = app.config['FEED_BACKOFF_MAX'] * 60
+        self.lease_seconds = app.config['FEED_LEASE_SECONDS']
+        self.holder = feed_lease.process_holder()
+        self.adaptive_refresh = app.config['ADAPTIVE_REFRESH_ENABLED']
+        self.min_interval = app.config['FEED_MIN_REFRESH_INTERVAL']
+        self.max_interval = app.config['FEED_MAX_REFRESH_INTERVAL']
+        app.extensions['feed_ingestor'] = self
+
+    def add_listener(self, callback):
+        """Register callback(feed, articles) to run after new articles from a feed are committed
+
+        articles are the inserted rows as dicts (id, feed_id, title, url, description,
+        published_at, fetched_at).
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, feed, articles):
+        for callback in self._listeners:
+            try:
+                callback(feed, articles)
+            except Exception as e:
+                print(f"Ingestion listener failed: {e}")
+
+    def start(self):
+        """Start the background ingestion thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='feed-ingestor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Signal the background thread to stop after the current pass"""
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self.app.app_context():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Feed ingestion pass failed: {e}")
+                    db.session.rollback()
+            self._stop_event.wait(self.poll_interval)
+
+    @staticmethod
+    def is_due(feed, now):
+        """Check if a feed's effective interval has elapsed since it was last fetched
+
+        A feed with an open breaker is due (for one trial fetch) once its cooldown ends.
+        """
+        if feed.breaker_open_until is not None:
+            return feed.breaker_open_until <= now
+        if feed.last_updated is None:
+            return True
+        interval = timedelta(minutes=feed.effective_interval)
+        return feed.last_updated + interval <= now
+
+    def due_feeds(self, now=None):
+        """Get enabled feeds whose refresh interval has elapsed"""
+        now = now or datetime.utcnow()
+        feeds = Feed.query.filter_by(enabled=True).order_by(Feed.id).all()
+        return [feed for feed in feeds if self.is_due(feed, now) and not self.host_open(feed.url, now)]
+
+    def host_open(self, url, now):
+        """Check if the breaker for a feed's host is open (many consecutive failures across its feeds)"""
+        with self._hosts_lock:
+            state = self._hosts.get(urlsplit(url).hostname)
+            return state is not None and state[1] is not None and state[1] > now
+
+    def _reschedule(self, feed, published_times, found_new, now):
+        """Learn the feed's next interval from this fetch (no-op when adaptive refresh is off)"""
+        if self.adaptive_refresh:
+            feed.adaptive_interval = adapt_interval(
+                feed.effective_interval, published_times, found_new, self.min_interval, self.max_interval, now)
+
+    def _update_breakers(self, feed, error, now):
+        """Record a fetch outcome on the feed's breaker (persisted) and its host's (in memory)"""
+        host = urlsplit(feed.url).hostname
+        if error is None:
+            feed.reset_breaker()
+            with self._hosts_lock:
+                self._hosts.pop(host, None)
+            return
+
+        feed.consecutive_failures = (feed.consecutive_failures or 0) + 1
+        feed.last_error = f"{type(error).__name__}: {error}"[:255]
+        if feed.consecutive_failures >= self.breaker_threshold:
+            feed.breaker_open_until = now + backoff_delay(
+                feed.consecutive_failures, self.breaker_threshold, self.backoff_base, self.backoff_max)
+            print(f"Feed {feed.name} failed {feed.consecutive_failures} times; skipping until {feed.breaker_open_until}")
+
+        with self._hosts_lock:
+            state = self._hosts.setdefault(host, [0, None])
+            state[0] += 1
+            if state[0] >= self.host_breaker_threshold:
+                state[1] = now + backoff_delay(state[0], self.host_breaker_threshold, self.backoff_base, self.backoff_max)
+                print(f"Host {host} failed {state[0]} times in a row; skipping its feeds until {state[1]}")
+
+    def run_once(self):
+        """Ingest every due feed this process can lease; returns the number of new articles stored"""
+        feeds = self.due_feeds()
+        if not feeds:
+            return 0
+
+        token, claimed = feed_lease.claim([feed.id for feed in feeds], self.holder, self.lease_seconds)
+        try:
+            # The claim commit reloads each feed, so feeds another process finished
+            # between due_feeds() and the claim are no longer due
+            now = datetime.utcnow()
+            feeds = [feed for feed in feeds if feed.id in claimed and self.is_due(feed, now)]
+            if not feeds:
+                return 0
+
+            # Fetch concurrently, then store serially in feed order so results merge deterministically
+            fetch_args = [(feed.url, feed.etag, feed.last_modified, feed.content_hash) for feed in feeds]
+            workers = min(self.fetch_concurrency, len(feeds))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='feed-fetch') as executor:
+                results = list(executor.map(lambda args: self.fetch_feed(*args), fetch_args))
+
+            held = feed_lease.renew(token, self.lease_seconds)
+            total = 0
+            for feed, result in zip(feeds, results):
+                if feed.id not in held:
+                    print(f"Lease on feed {feed.name} was taken over; discarding this fetch")
+                    continue
+                total += self.store_entries(feed, result)
+            self.flush_fetch_stats(prune=True)
+            self.prune_articles()
+            return total
+        finally:
+            db.session.rollback()
+            feed_lease.release(token)
+
+    def fetch_feed(self, url, etag=None, last_modified=None, content_hash=None):
+        """Fetch and parse one feed (runs on worker threads, so it must not touch the DB session)
+
+        Sends the stored validators as a conditional GET; a 304 response is returned
+        without parsing anything. A 200 whose body hashes to content_hash (the last
+        stored body) is marked unchanged and not parsed either.
+        """
+        result = {'status': None, 'entries': [], 'etag': etag, 'last_modified': last_modified, 'error': None,
+                  'latency_ms': None, 'bytes': None, 'parse_ms': None, 'content_hash': content_hash,
+                  'unchanged': False}
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        started = time.perf_counter()
+        try:
+            response, content = http_client.fetch_bytes(url, headers=headers)
+            result['latency_ms'] = (time.perf_counter() - started) * 1000
+            result['bytes'] = len(content)
+            result['status'] = response.status_code
+            if response.status_code == 304:
+                return result
+            response.raise_for_status()
+
+            result['etag'] = response.headers.get('ETag')
+            result['last_modified'] = response.headers.get('Last-Modified')
+            result['content_hash'] = hashlib.blake2b(content, digest_size=16).hexdigest()
+            if result['content_hash'] == content_hash:
+                result['unchanged'] = True
+                return result
+            parse_started = time.perf_counter()
+            result['entries'] = self.parse_entries(content)
+            result['parse_ms'] = (time.perf_counter() - parse_started) * 1000
+        except Exception as e:
+            result['error'] = e
+            if result['latency_ms'] is None:
+                result['latency_ms'] = (time.perf_counter() - started) * 1000
+        return result
+
+    def parse_entries(self, content):
+        """Stream-parse at most max_entries entries
+
+        feedparser takes over for malformed XML and for formats the streaming
+        parser doesn't understand (entries without links, which can't be stored).
+        """
+        try:
+            entries = list(RSSParser.iter_entries(content, self.max_entries))
+            if all(entry.get('link') for entry in entries):
+                return entries
+        except ET.ParseError:
+            pass
+        return feedparser.parse(content).get('entries', [])[:self.max_entries]
+
+    def store_entries(self, feed, result):
+        """Store fetched entries not already in the articles table"""
+        now = datetime.utcnow()
+        try:
+            if result['error'] is not None:
+                raise result['error']
+
+            if result['status'] == 304:
+                self.stats['not_modified'] += 1
+                feed.last_updated = now
+                self._update_breakers(feed, None, now)
+                self._reschedule(feed, [], False, now)
+                db.session.commit()
+                self._record_fetch(feed, result, 'not_modified', now)
+                return 0
+
+            if result['unchanged']:
+                # Same body as the last stored fetch (server ignored or rotated its validators)
+                self.stats['unchanged'] += 1
+                feed.etag = result['etag']
+                feed.last_modified = result['last_modified']
+                feed.last_updated = now
+                self._update_breakers(feed, None, now)
+                self._reschedule(feed, [], False, now)
+                db.session.commit()
+                self._record_fetch(feed, result, 'unchanged', now)
+                return 0
+
+            self.stats['fetched'] += 1
+            feed.etag = result['etag']
+            feed.last_modified = result['last_modified']
+            entries = result['entries']
+
+            rows = []
+            unparsed = []
+            published_times = []
+            for entry in entries:
+                title = entry.get('title') or 'No title'
+                raw_date = entry.get('published') or entry.get('updated') or ''
+                published_at = parse_timestamp(raw_date)
+                if published_at is not None:
+                    published_times.append(published_at)
+                elif raw_date:
+                    unparsed.append(raw_date)
+                rows.append(dict(
+                    derived_fields(title, feed.name),
+                    feed_id=feed.id,
+                    title=title,
+                    url=entry.get('link'),
+                    description=entry.get('summary', entry.get('description', '')),
+                    published_at=published_at or now,
+                    published_estimated=published_at is None,
+                    fetched_at=now
+                ))
+
+            if unparsed:
+                # Stored with their first-seen time and flagged published_estimated
+                self.stats['unparsed_dates'] += len(unparsed)
+                print(f"Feed {feed.name}: {len(unparsed)} entries with unparseable dates, e.g. {unparsed[0]!r}")
+
+            # Single-statement upsert; rows already stored for (feed_id, url) are skipped
+            added, skipped = upsert_articles(rows)
+            self.stats['inserted'] += len(added)
+            self.stats['skipped'] += skipped
+
+            feed.content_hash = result['content_hash']
+            feed.last_updated = now
+            self._update_breakers(feed, None, now)
+            self._reschedule(feed, published_times, bool(added), now)
+            db.session.commit()
+            self._record_fetch(feed, result, 'ok', now)
+            if added:
+                self._notify(feed, added)
+            return len(added)
+        except Exception as e:
+            db.session.rollback()
+            self.stats['errors'] += 1
+            self._record_fetch(feed, dict(result, error=e), 'error', now)
+            print(f"Error ingesting feed {feed.name}: {e}")
+            # Still advance last_updated so a broken feed waits for its next interval,
+            # or for its breaker cooldown after repeated failures
+            feed.last_updated = now
+            self._update_breakers(feed, e, now)
+            db.session.commit()
+            return 0
+
+    def _record_fetch(self, feed, result, outcome, now):
+        """Buffer one telemetry row; written by flush_fetch_stats in batches"""
+        error = result.get('error')
+        self._fetch_stats.append({
+            'feed_id': feed.id,
+            'fetched_at': now,
+            'outcome': outcome,
+            'http_status': result.get('status'),
+            'latency_ms': result.get('latency_ms'),
+            'bytes': result.get('bytes'),
+            'parse_ms': result.get('parse_ms'),
+            'entry_count': len(result.get('entries') or []) if outcome == 'ok' else None,
+            'error_class': type(error).__name__ if error is not None else None
+        })
+        metrics.observe_feed_fetch(feed.name, outcome, result.get('latency_ms'), result.get('parse_ms'))
+        if len(self._fetch_stats) >= self.stats_flush_size:
+            self.flush_fetch_stats()
+
+    def flush_fetch_stats(self, prune=False):
+        """Write buffered telemetry rows in one executemany, optionally pruning expired rows"""
+        rows, self._fetch_stats = self._fetch_stats, []
+        try:
+            if rows:
+                db.session.execute(FeedFetchStat.__table__.insert(), rows)
+            if prune:
+                cutoff = datetime.utcnow() - self.stats_retention
+                db.session.query(FeedFetchStat).filter(FeedFetchStat.fetched_at < cutoff) \
+                    .delete(synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error writing feed fetch stats: {e}")
+
+    def prune_articles(self):
+        """Delete articles first seen more than ARTICLE_RETENTION_DAYS ago (0 keeps them all)"""
+        if self.article_retention_days <= 0:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(days=self.article_retention_days)
+        try:
+            deleted = db.session.query(Article).filter(Article.fetched_at < cutoff) \
+                .delete(synchronize_session=False)
+            db.session.commit()
+            return deleted
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error pruning old articles: {e}")
+            return 0
@@ -0,0 +1,107 @@
+"""
+Prometheus metrics
+Request latency per endpoint, feed fetch/parse latency per feed and SQLAlchemy pool usage.
+Under gunicorn set PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py) so /metrics sums every worker.
+"""
+
+import os
+import time
+
+try:
+    from prometheus_client import (
+        CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+    )
+    from prometheus_client import multiprocess
+except ImportError:  # Metrics are optional; everything below becomes a no-op
+    Histogram = None
+
+# Request latencies are mostly small; feed fetches run up to the read timeout
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30)
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30)
+
+available = Histogram is not None
+
+if available:
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'Flask request latency by endpoint',
+        ['endpoint', 'method', 'status'], buckets=REQUEST_BUCKETS)
+    FEED_FETCH_LATENCY = Histogram(
+        'feed_fetch_duration_seconds', 'Feed HTTP fetch latency (request start until the body was read)',
+        ['feed'], buckets=FETCH_BUCKETS)
+    FEED_PARSE_LATENCY = Histogram(
+        'feed_parse_duration_seconds', 'Feed parse time', ['feed'], buckets=PARSE_BUCKETS)
+    FEED_FETCHES = Counter(
+        'feed_fetches_total', 'Feed fetches by outcome', ['feed', 'outcome'])
+    # Gauges are summed over live workers; limits are the same in every worker
+    DB_POOL_CHECKED_OUT = Gauge(
+        'db_pool_checked_out', 'Connections currently checked out', multiprocess_mode='livesum')
+    DB_POOL_OVERFLOW = Gauge(
+        'db_pool_overflow', 'Connections open beyond pool_size', multiprocess_mode='livesum')
+    DB_POOL_SIZE = Gauge(
+        'db_pool_size', 'Configured pool_size per worker', multiprocess_mode='livemax')
+    DB_POOL_MAX_OVERFLOW = Gauge(
+        'db_pool_max_overflow', 'Configured max_overflow per worker', multiprocess_mode='livemax')
+    DB_POOL_WAIT = Histogram(
+        'db_pool_checkout_wait_seconds', 'Time spent waiting for a pooled connection',
+        buckets=POOL_WAIT_BUCKETS)
+
+
+def observe_request(endpoint, method, status, seconds):
+    if available:
+        REQUEST_LATENCY.labels(endpoint or 'unmatched', method, str(status)).observe(seconds)
+
+
+def observe_feed_fetch(feed_name, outcome, latency_ms, parse_ms):
+    """Record one fetch; latencies are in milliseconds as measured by the ingestor"""
+    if not available:
+        return
+    FEED_FETCHES.labels(feed_name, outcome).inc()
+    if latency_ms is not None:
+        FEED_FETCH_LATENCY.labels(feed_name).observe(latency_ms / 1000)
+    if parse_ms is not None:
+        FEED_PARSE_LATENCY.labels(feed_name).observe(parse_ms / 1000)
+
+
+def instrument_pool(engine, pool_size, max_overflow):
+    """Track checkout wait time and checked-out/overflow counts for an engine's QueuePool"""
+    if not available:
+        return
+    from sqlalchemy import event
+
+    pool = engine.pool
+    DB_POOL_SIZE.set(pool_size)
+    DB_POOL_MAX_OVERFLOW.set(max_overflow)
+
+    def update_gauges(*args):
+        if hasattr(pool, 'checkedout'):
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    event.listen(pool, 'checkout', update_gauges)
+    event.listen(pool, 'checkin', update_gauges)
+
+    # QueuePool blocks inside _do_get when every connection is in use
+    do_get = getattr(pool, '_do_get', None)
+    if do_get is None:
+        return
+
+    def timed_do_get():
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+    pool._do_get = timed_do_get
+
+
+def render():
+    """Return (body, content_type) for the /metrics endpoint"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
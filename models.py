@@ -69,7 +69,15 @@ class Feed(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('categories.id'))
     enabled = db.Column(db.Boolean, default=True)
     refresh_interval = db.Column(db.Integer, default=60)  # Minutes
+    adaptive_interval = db.Column(db.Integer)  # Minutes, learned from publish cadence; overrides refresh_interval
     last_updated = db.Column(db.DateTime)
+    etag = db.Column(db.String(255))  # HTTP validators for conditional GET
+    last_modified = db.Column(db.String(255))
+    content_hash = db.Column(db.String(32))  # Hash of the last stored body, to skip reparsing identical ones
+    # Circuit breaker: skipped until breaker_open_until after repeated failures
+    consecutive_failures = db.Column(db.Integer, default=0, nullable=False)
+    breaker_open_until = db.Column(db.DateTime)
+    last_error = db.Column(db.String(255))
     created_by = db.Column(db.String(36), db.ForeignKey('users.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
@@ -80,6 +88,26 @@ class Feed(db.Model):
         db.UniqueConstraint('url', name='uq_feed_url'),
     )
     
+    @property
+    def effective_interval(self):
+        """Minutes between fetches: the learned interval, else the configured one"""
+        return self.adaptive_interval or self.refresh_interval or 60
+    
+    def reset_breaker(self):
+        """Close the circuit breaker (after a success or when an admin changes the feed)"""
+        self.consecutive_failures = 0
+        self.breaker_open_until = None
+        self.last_error = None
+    
+    def reset_source(self):
+        """Forget everything learned from the old URL so the new one is fetched in full on the next run"""
+        self.reset_breaker()
+        self.etag = None
+        self.last_modified = None
+        self.content_hash = None
+        self.adaptive_interval = None
+        self.last_updated = None
+    
     def __repr__(self):
         return f'<Feed {self.name}>'
 
@@ -106,14 +134,62 @@ class Article(db.Model):
     description = db.Column(db.Text)
     published_at = db.Column(db.DateTime)
     fetched_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # True when the entry had no parseable date and published_at is its first-seen time
+    published_estimated = db.Column(db.Boolean, nullable=False, default=False)
+    # Derived at ingest (article_store.derived_fields) so company/title sorts run on indexes
+    company = db.Column(db.String(255))
+    company_key = db.Column(db.String(255))
+    title_key = db.Column(db.String(255))
     
     __table_args__ = (
         db.UniqueConstraint('feed_id', 'url', name='uq_article_feed_url'),
+        db.Index('idx_articles_published', 'published_at', 'id'),  # Keyset pagination order
+        db.Index('idx_articles_company', 'company_key', published_at.desc(), 'id'),
+        db.Index('idx_articles_title', 'title_key', 'id'),
+        db.Index('idx_articles_fetched', 'fetched_at'),  # Retention pruning
     )
     
     def __repr__(self):
         return f'<Article {self.title[:50]}>'
 
+class FeedFetchStat(db.Model):
+    __tablename__ = 'feed_fetch_stats'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    feed_id = db.Column(db.Integer, db.ForeignKey('feeds.id', ondelete='CASCADE'), nullable=False)
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    outcome = db.Column(db.String(20), nullable=False)  # 'ok', 'not_modified', 'unchanged', 'error'
+    http_status = db.Column(db.Integer)
+    latency_ms = db.Column(db.Float)  # Request start until the body was read
+    bytes = db.Column(db.Integer)
+    parse_ms = db.Column(db.Float)
+    entry_count = db.Column(db.Integer)
+    error_class = db.Column(db.String(100))
+    
+    __table_args__ = (
+        db.Index('idx_feed_fetch_stats_feed_time', 'feed_id', 'fetched_at'),
+    )
+    
+    def __repr__(self):
+        return f'<FeedFetchStat {self.feed_id} {self.outcome}>'
+
+class FeedLease(db.Model):
+    __tablename__ = 'feed_leases'
+    
+    # One row per feed; a process may fetch the feed while it holds an unexpired lease
+    feed_id = db.Column(db.Integer, db.ForeignKey('feeds.id', ondelete='CASCADE'), primary_key=True, autoincrement=False)
+    holder = db.Column(db.String(255))  # host:pid of the claiming process, for diagnostics
+    claim_token = db.Column(db.String(32))  # Unique per claim, identifies the holder's rows
+    claimed_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('idx_feed_leases_token', 'claim_token'),
+    )
+    
+    def __repr__(self):
+        return f'<FeedLease {self.feed_id} {self.holder}>'
+
 # Role constants
 class Roles:
     ADMIN = 'admin'
@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque tokens holding the sort the page belongs to and the sort key of its last row
+"""
+
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Value types of each sort's key, in column order
+_KEY_TYPES = {
+    'date': (datetime, int),
+    'company': (str, datetime, int),
+    'title': (str, int),
+    'relevance': ((int, float), datetime, int),
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token can't be decoded or belongs to a different sort"""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(sort_by, sort_order, key):
+    """Encode the sort key of the last row on a page as an opaque cursor token"""
+    payload = {'s': sort_by, 'o': sort_order, 'k': [_encode_value(value) for value in key]}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, sort_by, sort_order):
+    """Decode a cursor token back to its sort key, checking it was issued for this sort"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict) or not isinstance(payload['k'], list):
+            raise ValueError('not a cursor object')
+        key = [_decode_value(value) for value in payload['k']]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f'Malformed cursor: {e}')
+
+    if payload.get('s') != sort_by or payload.get('o') != sort_order:
+        raise InvalidCursor('Cursor was issued for a different sort order')
+    _check_key(key, _KEY_TYPES.get(sort_by))
+    return key
+
+
+def _check_key(key, types):
+    if types is None:
+        return
+    if len(key) != len(types):
+        raise InvalidCursor('Malformed cursor: wrong number of key values')
+    for value, expected in zip(key, types):
+        if isinstance(value, bool) or not isinstance(value, expected):
+            raise InvalidCursor('Malformed cursor: unexpected key value')
+
+
+def keyset_filter(columns, key, descending):
+    """Build a row-value comparison (columns) < key (or > key) as portable AND/OR clauses
+
+    SQL Server has no row-value comparison, so (a, b) < (x, y) is expanded to
+    a < x OR (a = x AND b < y), which still lets the database seek on an index over the columns.
+    descending is a bool, or one bool per column for mixed-direction sorts.
+    """
+    if isinstance(descending, bool):
+        descending = [descending] * len(columns)
+    clauses = []
+    for i, column in enumerate(columns):
+        equal_prefix = [columns[j] == key[j] for j in range(i)]
+        comparison = column < key[i] if descending[i] else column > key[i]
+        clauses.append(and_(*equal_prefix, comparison))
+    return or_(*clauses)
+
+
+def page_size_from(value):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    if not value or value <= 0:
+        return DEFAULT_PAGE_SIZE
+    return min(value, MAX_PAGE_SIZE)
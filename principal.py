@@ -0,0 +1,89 @@
+"""
+Resolved signed-in user
+A plain snapshot of a User and its role names, resolved once per request and optionally cached across requests
+"""
+
+import copy
+import threading
+import time
+from models import Roles
+
+
+class Principal:
+    """Snapshot of a User with its roles, detached from the database session"""
+
+    def __init__(self, id, email, name, roles):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.roles = tuple(roles)
+
+    @classmethod
+    def from_user(cls, user):
+        """Build a principal from a User whose roles are already loaded"""
+        return cls(user.id, user.email, user.name, [role.role_name for role in user.roles])
+
+    def for_session(self, session_user):
+        """Return a copy carrying the session's display name/email for templates"""
+        principal = copy.copy(self)
+        principal.session_name = session_user.get('name', self.name)
+        principal.session_email = session_user.get('preferred_username', self.email)
+        return principal
+
+    def get(self, key, default=None):
+        """Dict-style access used by templates written for the session user dict"""
+        return getattr(self, key, default)
+
+    def has_role(self, role_name):
+        """Check if user has a specific role"""
+        return role_name in self.roles
+
+    def get_roles(self):
+        """Get list of role names for this user"""
+        return list(self.roles)
+
+    @property
+    def can_manage_feeds(self):
+        return any(Roles.can_manage_feeds(role) for role in self.roles)
+
+    @property
+    def can_manage_categories(self):
+        return any(Roles.can_manage_categories(role) for role in self.roles)
+
+    @property
+    def can_manage_users(self):
+        return any(Roles.can_manage_users(role) for role in self.roles)
+
+    def __repr__(self):
+        return f'<Principal {self.email}>'
+
+
+class PrincipalCache:
+    """Short-TTL, per-process cache of principals by user id (ttl=0 disables it)"""
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return entry[1]
+
+    def set(self, principal):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.ttl, principal)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
@@ -0,0 +1,198 @@
+"""
+Response cache for the articles API
+TTL + LRU cache of serialized responses, tagged by category so ingestion can invalidate precisely;
+in process memory, or in a SQLite file shared by the workers on a node
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of response bodies keyed by normalized query parameters
+
+    Each entry is tagged with the category it was filtered on (None for all
+    categories). New articles in a category invalidate that category's entries
+    and every unfiltered entry.
+    """
+
+    def __init__(self, ttl=60, max_entries=256, enabled=True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled and max_entries > 0
+        self._entries = OrderedDict()  # key -> (expires_at, category_id, body)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(*parts, search=''):
+        """Build a hashable cache key from already-normalized query parameters
+
+        Only the search text is case-folded, since search ignores case; every
+        other part (sort names, cursors) is kept exactly as it affects the response.
+        """
+        return (search.lower(),) + parts
+
+    def get(self, key):
+        """Return the cached body for key, or None on a miss or expired entry"""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, body, category_id=None):
+        """Store a response body, evicting least recently used entries past the size cap"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, category_id, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_category(self, category_id):
+        """Drop entries for a category and all unfiltered entries"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if entry[1] is None or entry[1] == category_id]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every entry (e.g. after feeds or categories change)"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size for tuning"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+class SharedResponseCache(ResponseCache):
+    """ResponseCache stored in a SQLite file, shared by every worker process on the node
+
+    Writes are atomic INSERT OR REPLACE statements; the least recently used
+    entries are evicted past max_entries. Invalidations from any worker (e.g.
+    the one whose ingestor stored new articles) apply to all of them.
+    Hit/miss counters are per process; size is shared. Database errors are
+    logged and treated as misses so the cache can never fail a request.
+    """
+
+    def __init__(self, path, ttl=60, max_entries=256, enabled=True):
+        super().__init__(ttl=ttl, max_entries=max_entries, enabled=enabled)
+        self.path = path
+        self._local = threading.local()
+        if self.enabled:
+            self._execute(
+                'CREATE TABLE IF NOT EXISTS response_cache ('
+                'key TEXT PRIMARY KEY, category_id INTEGER, expires_at REAL NOT NULL, '
+                'accessed_at REAL NOT NULL, body BLOB NOT NULL)'
+            )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _execute(self, sql, params=()):
+        """Run one statement; returns (rows, rowcount), or (None, 0) on a database error"""
+        try:
+            cursor = self._connection().execute(sql, params)
+            return cursor.fetchall(), cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"Shared response cache error: {e}")
+            return None, 0
+
+    def _size(self):
+        rows, _ = self._execute('SELECT COUNT(*) FROM response_cache')
+        return rows[0][0] if rows else 0
+
+    @staticmethod
+    def _key(key):
+        return json.dumps(key, separators=(',', ':'))
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        now = time.time()
+        rows, _ = self._execute('SELECT body, expires_at, accessed_at FROM response_cache WHERE key = ?', (self._key(key),))
+        if not rows or rows[0][1] <= now:
+            self.misses += 1
+            return None
+        body, _, accessed_at = rows[0]
+        if now - accessed_at > 1:  # Recency only needs second resolution; skip most writes on hot keys
+            self._execute('UPDATE response_cache SET accessed_at = ? WHERE key = ?', (now, self._key(key)))
+        self.hits += 1
+        return body
+
+    def set(self, key, body, category_id=None):
+        if not self.enabled:
+            return
+        now = time.time()
+        self._execute(
+            'INSERT OR REPLACE INTO response_cache (key, category_id, expires_at, accessed_at, body) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self._key(key), category_id, now + self.ttl, now, body)
+        )
+        if self._size() > self.max_entries:
+            self._execute('DELETE FROM response_cache WHERE expires_at <= ?', (now,))
+            excess = self._size() - self.max_entries
+            if excess > 0:
+                _, evicted = self._execute(
+                    'DELETE FROM response_cache WHERE key IN '
+                    '(SELECT key FROM response_cache ORDER BY accessed_at LIMIT ?)',
+                    (excess,)
+                )
+                self.evictions += max(evicted, 0)
+
+    def invalidate_category(self, category_id):
+        if not self.enabled:
+            return
+        _, dropped = self._execute('DELETE FROM response_cache WHERE category_id IS NULL OR category_id = ?', (category_id,))
+        self.invalidations += max(dropped, 0)
+
+    def clear(self):
+        if not self.enabled:
+            return
+        _, dropped = self._execute('DELETE FROM response_cache')
+        self.invalidations += max(dropped, 0)
+
+    def stats(self):
+        stats = super().stats()
+        stats['size'] = self._size() if self.enabled else 0
+        stats['shared_path'] = self.path
+        return stats
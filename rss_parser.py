@@ -3,12 +3,59 @@ Custom RSS parser that works with Python 3.13+
 Replaces feedparser which has compatibility issues with Python 3.13
 """
 
+import io
 import xml.etree.ElementTree as ET
-import requests
+import http_client
 from datetime import datetime
 from html import unescape
 import re
 
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+RSS1_NS = '{http://purl.org/rss/1.0/}'
+RDF_ABOUT = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about'
+
+
+def _field_table(*fields):
+    """Build a tag -> (field, priority) dispatch table from (field, tags) pairs
+
+    Each bare tag also matches its Atom, RSS 1.0 and Dublin Core namespaced forms; lower
+    priority wins when an element has several tags mapping to the same field.
+    """
+    table = {}
+    priority = 0
+    for field, tags in fields:
+        for tag in tags:
+            candidates = [tag] if tag.startswith('{') else [tag, ATOM_NS + tag, RSS1_NS + tag, DC_NS + tag]
+            for candidate in candidates:
+                table.setdefault(candidate, (field, priority))
+                priority += 1
+    return table
+
+
+_RSS_ITEM_FIELDS = _field_table(
+    ('title', ['title']),
+    ('link', ['link']),
+    ('description', ['description']),
+    ('published', ['pubDate', DC_NS + 'date']),
+    ('author', ['author', DC_NS + 'creator']),
+    ('guid', ['guid']),
+)
+
+_ATOM_ENTRY_FIELDS = _field_table(
+    ('title', ['title']),
+    ('published', ['published']),
+    ('updated', ['updated']),
+    ('guid', ['id']),
+    ('content', ['content', 'summary']),
+)
+
+_ATOM_LINK_TAGS = frozenset(['link', ATOM_NS + 'link'])
+_ATOM_AUTHOR_TAGS = frozenset(['author', ATOM_NS + 'author'])
+_ATOM_NAME_TAGS = frozenset(['name', ATOM_NS + 'name'])
+
+_HTML_TAG_RE = re.compile('<[^<]+?>')
+
 class RSSParser:
     """Simple RSS feed parser compatible with Python 3.13+"""
     
@@ -16,9 +63,9 @@ class RSSParser:
     def parse(url):
         """Parse RSS feed from URL"""
         try:
-            response = requests.get(url, timeout=10)
+            response, content = http_client.fetch_bytes(url)
             response.raise_for_status()
-            return RSSParser.parse_string(response.text)
+            return RSSParser.parse_string(content)
         except Exception as e:
             print(f"Error fetching RSS feed: {e}")
             return {'entries': []}
@@ -32,7 +79,7 @@ class RSSParser:
             # Handle both RSS 2.0 and Atom feeds
             if root.tag == 'rss' or 'rss' in root.tag:
                 return RSSParser._parse_rss(root)
-            elif 'feed' in root.tag.lower() or 'atom' in xml_content[:100].lower():
+            elif 'feed' in root.tag.lower() or 'atom' in str(xml_content[:100]).lower():
                 return RSSParser._parse_atom(root)
             else:
                 # Try RSS parsing as default
@@ -54,24 +101,7 @@ class RSSParser:
         
         # Parse items
         for item in channel.findall('item'):
-            entry = {
-                'title': RSSParser._get_text(item, 'title'),
-                'link': RSSParser._get_text(item, 'link'),
-                'description': RSSParser._clean_html(RSSParser._get_text(item, 'description')),
-                'summary': RSSParser._clean_html(RSSParser._get_text(item, 'description')),
-                'published': RSSParser._get_text(item, 'pubDate'),
-                'author': RSSParser._get_text(item, 'author') or RSSParser._get_text(item, 'dc:creator'),
-                'guid': RSSParser._get_text(item, 'guid'),
-            }
-            
-            # Parse categories
-            categories = []
-            for cat in item.findall('category'):
-                if cat.text:
-                    categories.append(cat.text)
-            entry['categories'] = categories
-            
-            entries.append(entry)
+            entries.append(RSSParser._parse_rss_item(item))
         
         return {
             'entries': entries,
@@ -92,35 +122,7 @@ class RSSParser:
         
         # Parse entries
         for entry in root.findall('.//atom:entry', ns) or root.findall('.//entry'):
-            item = {
-                'title': RSSParser._get_text(entry, 'title') or RSSParser._get_text(entry, '{http://www.w3.org/2005/Atom}title'),
-                'link': '',
-                'description': '',
-                'summary': '',
-                'published': RSSParser._get_text(entry, 'published') or RSSParser._get_text(entry, 'updated'),
-                'author': '',
-                'guid': RSSParser._get_text(entry, 'id'),
-            }
-            
-            # Get link
-            link_elem = entry.find('link') or entry.find('{http://www.w3.org/2005/Atom}link')
-            if link_elem is not None:
-                item['link'] = link_elem.get('href', '')
-            
-            # Get content/summary
-            content = RSSParser._get_text(entry, 'content') or RSSParser._get_text(entry, 'summary')
-            if not content:
-                content = RSSParser._get_text(entry, '{http://www.w3.org/2005/Atom}content') or RSSParser._get_text(entry, '{http://www.w3.org/2005/Atom}summary')
-            
-            item['description'] = RSSParser._clean_html(content)
-            item['summary'] = item['description']
-            
-            # Get author
-            author_elem = entry.find('author') or entry.find('{http://www.w3.org/2005/Atom}author')
-            if author_elem is not None:
-                item['author'] = RSSParser._get_text(author_elem, 'name') or RSSParser._get_text(author_elem, '{http://www.w3.org/2005/Atom}name')
-            
-            entries.append(item)
+            entries.append(RSSParser._parse_atom_entry(entry))
         
         return {
             'entries': entries,
@@ -131,6 +133,134 @@ class RSSParser:
             }
         }
     
+    @staticmethod
+    def _parse_rss_item(item):
+        """Parse a single RSS <item> element in one pass over its children"""
+        found = {}
+        categories = []
+        permalink = True
+        for child in item:
+            tag = child.tag
+            if tag == 'guid':
+                permalink = child.get('isPermaLink', 'true').lower() != 'false'
+            if tag == 'category':
+                if child.text:
+                    categories.append(child.text)
+                continue
+            mapping = _RSS_ITEM_FIELDS.get(tag)
+            if mapping is None:
+                continue
+            field, priority = mapping
+            if field not in found or priority < found[field][0]:
+                found[field] = (priority, child.text)
+        
+        def text(field):
+            value = found.get(field, (None, None))[1]
+            return value.strip() if value else ''
+        
+        # Without a <link>, a permalink guid (RSS 2.0) or rdf:about (RSS 1.0) is the item's URL
+        link = text('link')
+        if not link and permalink and text('guid').startswith(('http://', 'https://')):
+            link = text('guid')
+        if not link:
+            link = (item.get(RDF_ABOUT) or '').strip()
+        
+        description = RSSParser._clean_html(text('description'))
+        return {
+            'title': text('title'),
+            'link': link,
+            'description': description,
+            'summary': description,
+            'published': text('published'),
+            'author': text('author'),
+            'guid': text('guid'),
+            'categories': categories,
+        }
+    
+    @staticmethod
+    def _parse_atom_entry(entry):
+        """Parse a single Atom <entry> element in one pass over its children"""
+        found = {}
+        link = None
+        author = ''
+        for child in entry:
+            tag = child.tag
+            if tag in _ATOM_LINK_TAGS:
+                # Prefer the first alternate link, otherwise the first link of any kind
+                if link is None or (link[0] != 'alternate' and child.get('rel', 'alternate') == 'alternate'):
+                    link = (child.get('rel', 'alternate'), child.get('href', ''))
+                continue
+            if tag in _ATOM_AUTHOR_TAGS:
+                if not author:
+                    for name in child:
+                        if name.tag in _ATOM_NAME_TAGS and name.text:
+                            author = name.text.strip()
+                            break
+                continue
+            mapping = _ATOM_ENTRY_FIELDS.get(tag)
+            if mapping is None:
+                continue
+            field, priority = mapping
+            if field not in found or priority < found[field][0]:
+                found[field] = (priority, child.text)
+        
+        def text(field):
+            value = found.get(field, (None, None))[1]
+            return value.strip() if value else ''
+        
+        description = RSSParser._clean_html(text('content'))
+        return {
+            'title': text('title'),
+            'link': link[1] if link else '',
+            'description': description,
+            'summary': description,
+            'published': text('published') or text('updated'),
+            'author': author,
+            'guid': text('guid'),
+        }
+    
+    @staticmethod
+    def iter_entries(source, max_entries=None):
+        """Incrementally parse RSS/Atom entries, yielding each one as soon as it is complete
+        
+        source can be XML bytes/str or a binary file-like object. Parsing stops after
+        max_entries entries and processed elements are cleared as we go, so memory and
+        parse time depend on the entries consumed rather than the size of the feed.
+        Raises xml.etree.ElementTree.ParseError on malformed XML.
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8')
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        
+        if max_entries is not None and max_entries <= 0:
+            return
+        
+        count = 0
+        parents = []
+        for event, elem in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                parents.append(elem)
+                continue
+            
+            parents.pop()
+            local_name = elem.tag.rsplit('}', 1)[-1]
+            if local_name == 'item':
+                yield RSSParser._parse_rss_item(elem)
+            elif local_name == 'entry':
+                yield RSSParser._parse_atom_entry(elem)
+            else:
+                continue
+            
+            # Drop the processed entry so the tree never holds more than one at a time
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+            
+            count += 1
+            if max_entries is not None and count >= max_entries:
+                return
+    
     @staticmethod
     def _get_text(parent, tag):
         """Safely get text from an XML element"""
@@ -157,7 +287,7 @@ class RSSParser:
             return ''
         
         # Remove HTML tags
-        clean_text = re.sub('<[^<]+?>', '', html_text)
+        clean_text = _HTML_TAG_RE.sub('', html_text)
         
         # Decode HTML entities
         clean_text = unescape(clean_text)
@@ -169,7 +299,9 @@ class RSSParser:
 
 # Create a feedparser-compatible interface
 def parse(url_or_string):
-    """Parse RSS feed from URL or XML string - feedparser compatible interface"""
+    """Parse RSS feed from URL, XML string or raw bytes - feedparser compatible interface"""
+    if isinstance(url_or_string, bytes):
+        return RSSParser.parse_string(url_or_string)
     if url_or_string.startswith('http'):
         return RSSParser.parse(url_or_string)
     else:
@@ -28,7 +28,14 @@ CREATE TABLE feeds (
     category_id INT REFERENCES categories(id),
     enabled BIT DEFAULT 1,
     refresh_interval INT DEFAULT 60,           -- Minutes
+    adaptive_interval INT,                     -- Minutes learned from publish cadence
     last_updated DATETIME2,
+    etag NVARCHAR(255),                        -- HTTP validators for conditional GET
+    last_modified NVARCHAR(255),
+    content_hash NVARCHAR(32),                 -- Hash of the last stored body
+    consecutive_failures INT NOT NULL DEFAULT 0,  -- Circuit breaker state
+    breaker_open_until DATETIME2,
+    last_error NVARCHAR(255),
     created_by NVARCHAR(36) REFERENCES users(id),
     created_at DATETIME2 DEFAULT GETUTCDATE()
 );
@@ -55,13 +62,40 @@ CREATE TABLE articles (
     url NTEXT NOT NULL,
     description NTEXT,
     published_at DATETIME2,
-    fetched_at DATETIME2 DEFAULT GETUTCDATE()
+    fetched_at DATETIME2 DEFAULT GETUTCDATE(),
+    published_estimated BIT NOT NULL DEFAULT 0,  -- No parseable date; published_at is first-seen time
+    company NVARCHAR(255),                  -- Derived at ingest for indexed sorting
+    company_key NVARCHAR(255),
+    title_key NVARCHAR(255)
 );
 
 -- Unique constraint on article URL per feed
 CREATE UNIQUE INDEX IX_articles_feed_url ON articles(feed_id, url)
 WHERE url IS NOT NULL;
 
+-- Per-fetch feed telemetry (latency, size, status, parse time, errors)
+CREATE TABLE feed_fetch_stats (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    feed_id INT NOT NULL REFERENCES feeds(id) ON DELETE CASCADE,
+    fetched_at DATETIME2 NOT NULL DEFAULT GETUTCDATE(),
+    outcome NVARCHAR(20) NOT NULL,             -- 'ok', 'not_modified', 'unchanged', 'error'
+    http_status INT,
+    latency_ms FLOAT,
+    bytes INT,
+    parse_ms FLOAT,
+    entry_count INT,
+    error_class NVARCHAR(100)
+);
+
+-- Fetch leases: the process holding an unexpired lease on a feed is the only one fetching it
+CREATE TABLE feed_leases (
+    feed_id INT PRIMARY KEY REFERENCES feeds(id) ON DELETE CASCADE,
+    holder NVARCHAR(255),                      -- host:pid of the claiming process
+    claim_token NVARCHAR(32),
+    claimed_at DATETIME2,
+    expires_at DATETIME2
+);
+
 -- Default categories
 INSERT INTO categories (name, color, description) VALUES
 ('Technology', '#6366f1', 'Technology and software news'),
@@ -74,5 +108,18 @@ INSERT INTO categories (name, color, description) VALUES
 CREATE INDEX IX_feeds_category ON feeds(category_id);
 CREATE INDEX IX_feeds_enabled ON feeds(enabled);
 CREATE INDEX IX_articles_feed ON articles(feed_id);
-CREATE INDEX IX_articles_published ON articles(published_at DESC);
-CREATE INDEX IX_user_roles_user ON user_roles(user_id);
\ No newline at end of file
+CREATE INDEX IX_articles_published ON articles(published_at DESC, id DESC);
+CREATE INDEX IX_articles_company ON articles(company_key, published_at DESC, id);
+CREATE INDEX IX_articles_title ON articles(title_key, id);
+CREATE INDEX IX_articles_fetched ON articles(fetched_at);
+CREATE INDEX IX_feed_fetch_stats_feed_time ON feed_fetch_stats(feed_id, fetched_at);
+CREATE INDEX IX_feed_leases_token ON feed_leases(claim_token);
+CREATE INDEX IX_user_roles_user ON user_roles(user_id);
+
+-- Full-text search over article title and description (used by search_index.py)
+-- Run outside a transaction; without it search falls back to LIKE matching
+CREATE UNIQUE INDEX UX_articles_id ON articles(id);
+CREATE FULLTEXT CATALOG ftc_articles AS DEFAULT;
+CREATE FULLTEXT INDEX ON articles(title, description)
+    KEY INDEX UX_articles_id
+    WITH CHANGE_TRACKING AUTO;
@@ -28,7 +28,14 @@ CREATE TABLE feeds (
     category_id INTEGER REFERENCES categories(id),
     enabled BOOLEAN DEFAULT TRUE,
     refresh_interval INTEGER DEFAULT 60,    -- Minutes
+    adaptive_interval INTEGER,              -- Minutes learned from publish cadence
     last_updated TIMESTAMP,
+    etag VARCHAR(255),                      -- HTTP validators for conditional GET
+    last_modified VARCHAR(255),
+    content_hash VARCHAR(32),               -- Hash of the last stored body
+    consecutive_failures INTEGER NOT NULL DEFAULT 0,  -- Circuit breaker state
+    breaker_open_until TIMESTAMP,
+    last_error VARCHAR(255),
     created_by UUID REFERENCES users(id),
     created_at TIMESTAMP DEFAULT NOW(),
     
@@ -54,10 +61,37 @@ CREATE TABLE articles (
     description TEXT,
     published_at TIMESTAMP,
     fetched_at TIMESTAMP DEFAULT NOW(),
+    published_estimated BOOLEAN NOT NULL DEFAULT FALSE,  -- No parseable date; published_at is first-seen time
+    company VARCHAR(255),                   -- Derived at ingest for indexed sorting
+    company_key VARCHAR(255),
+    title_key VARCHAR(255),
     
     CONSTRAINT articles_url_unique UNIQUE(feed_id, url)
 );
 
+-- Per-fetch feed telemetry (latency, size, status, parse time, errors)
+CREATE TABLE feed_fetch_stats (
+    id SERIAL PRIMARY KEY,
+    feed_id INTEGER NOT NULL REFERENCES feeds(id) ON DELETE CASCADE,
+    fetched_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    outcome VARCHAR(20) NOT NULL,           -- 'ok', 'not_modified', 'unchanged', 'error'
+    http_status INTEGER,
+    latency_ms DOUBLE PRECISION,
+    bytes INTEGER,
+    parse_ms DOUBLE PRECISION,
+    entry_count INTEGER,
+    error_class VARCHAR(100)
+);
+
+-- Fetch leases: the process holding an unexpired lease on a feed is the only one fetching it
+CREATE TABLE feed_leases (
+    feed_id INTEGER PRIMARY KEY REFERENCES feeds(id) ON DELETE CASCADE,
+    holder VARCHAR(255),                    -- host:pid of the claiming process
+    claim_token VARCHAR(32),
+    claimed_at TIMESTAMP,
+    expires_at TIMESTAMP
+);
+
 -- Default categories
 INSERT INTO categories (name, color, description) VALUES
 ('Technology', '#6366f1', 'Technology and software news'),
@@ -70,5 +104,14 @@ INSERT INTO categories (name, color, description) VALUES
 CREATE INDEX idx_feeds_category ON feeds(category_id);
 CREATE INDEX idx_feeds_enabled ON feeds(enabled);
 CREATE INDEX idx_articles_feed ON articles(feed_id);
-CREATE INDEX idx_articles_published ON articles(published_at DESC);
-CREATE INDEX idx_user_roles_user ON user_roles(user_id);
\ No newline at end of file
+CREATE INDEX idx_articles_published ON articles(published_at DESC, id DESC);
+CREATE INDEX idx_articles_company ON articles(company_key, published_at DESC, id);
+CREATE INDEX idx_articles_title ON articles(title_key, id);
+CREATE INDEX idx_articles_fetched ON articles(fetched_at);
+CREATE INDEX idx_user_roles_user ON user_roles(user_id);
+CREATE INDEX idx_feed_fetch_stats_feed_time ON feed_fetch_stats(feed_id, fetched_at);
+CREATE INDEX idx_feed_leases_token ON feed_leases(claim_token);
+
+-- Full-text search over article title and description (must match search_index.py)
+CREATE INDEX idx_articles_fts ON articles
+    USING GIN (to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, '')));
@@ -0,0 +1,65 @@
+"""
+Startup schema upgrade
+db.create_all() only creates missing tables, so columns and indexes added to existing tables
+(feeds, articles) are added here. Every step checks the live schema first, so it is safe to run
+on each start; fresh databases created from the models or schema files have nothing to do.
+"""
+
+from sqlalchemy import inspect, literal, text
+from models import db
+
+
+def _column_ddl(column, dialect):
+    """Column definition for ALTER TABLE ... ADD, with a default so NOT NULL works on existing rows"""
+    preparer = dialect.identifier_preparer
+    ddl = f'{preparer.quote(column.name)} {column.type.compile(dialect=dialect)}'
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        value = literal(default, column.type).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+        ddl += f' DEFAULT {value}'
+    if not column.nullable and default is not None:
+        ddl += ' NOT NULL'
+    return ddl
+
+
+def _add_columns(connection, inspector, table):
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    dialect = connection.dialect
+    # SQL Server writes ADD without the COLUMN keyword
+    add = 'ADD' if dialect.name == 'mssql' else 'ADD COLUMN'
+    added = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        connection.execute(text(
+            f'ALTER TABLE {dialect.identifier_preparer.quote(table.name)} {add} {_column_ddl(column, dialect)}'))
+        added.append(column.name)
+    return added
+
+
+def _add_indexes(connection, inspector, table):
+    # Match on columns rather than names: the SQL Server schema file names its indexes IX_...
+    existing_names = {index['name'] for index in inspector.get_indexes(table.name)}
+    existing_columns = {tuple(index['column_names']) for index in inspector.get_indexes(table.name)}
+    added = []
+    for index in table.indexes:
+        columns = tuple(column.name for column in index.columns)
+        if index.name in existing_names or columns in existing_columns:
+            continue
+        index.create(connection)
+        added.append(index.name)
+    return added
+
+
+def upgrade_schema():
+    """Add model columns and indexes missing from existing tables; returns the names added"""
+    changes = []
+    with db.engine.begin() as connection:
+        inspector = inspect(connection)
+        tables = set(inspector.get_table_names())
+        for table in db.metadata.sorted_tables:
+            if table.name not in tables:
+                continue  # create_all makes new tables complete
+            changes += [f'{table.name}.{name}' for name in _add_columns(connection, inspector, table)]
+            changes += [f'{table.name}:{name}' for name in _add_indexes(connection, inspector, table)]
+    return changes
@@ -0,0 +1,205 @@
+"""
+Full-text article search
+Uses the database's own full-text engine: FTS5 on SQLite, a GIN tsvector index on PostgreSQL
+and CONTAINSTABLE on SQL Server. All three are kept up to date by the database as articles
+are inserted, so ingestion doesn't need to know about the index.
+
+Query syntax: plain words must all match, "quoted phrases" match in order and a trailing
+* matches a prefix (e.g. micro*). Feed names are matched separately against the (small)
+feeds table; the company shown for an article always comes from its title or feed name,
+so it is covered by those two.
+"""
+
+import re
+from sqlalchemy import text, Integer, Float
+from models import db, Article, Feed
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+# Cached per process: whether SQL Server has an active full-text index on articles
+_mssql_fulltext = None
+
+_SQLITE_SETUP = [
+    "CREATE VIRTUAL TABLE articles_fts USING fts5("
+    "title, description, content='articles', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO articles_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    # Index any articles stored before the FTS table existed
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+]
+
+_POSTGRES_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+
+def parse_query(query):
+    """Split a search string into ('word', w), ('prefix', w) and ('phrase', [words]) terms"""
+    terms = []
+    for phrase, token in _TOKEN_RE.findall(query.lower()):
+        if phrase:
+            words = _WORD_RE.findall(phrase)
+            if len(words) > 1:
+                terms.append(('phrase', words))
+            elif words:
+                terms.append(('word', words[0]))
+            continue
+
+        words = _WORD_RE.findall(token)
+        for i, word in enumerate(words):
+            # A trailing * only applies to the last word of the token
+            if token.endswith('*') and i == len(words) - 1:
+                terms.append(('prefix', word))
+            else:
+                terms.append(('word', word))
+    return terms
+
+
+def _fts5_query(terms):
+    parts = []
+    for kind, value in terms:
+        if kind == 'phrase':
+            parts.append('"' + ' '.join(value) + '"')
+        elif kind == 'prefix':
+            parts.append(f'"{value}"*')
+        else:
+            parts.append(f'"{value}"')
+    return ' '.join(parts)
+
+
+def _tsquery(terms):
+    parts = []
+    for kind, value in terms:
+        if kind == 'phrase':
+            parts.append('(' + ' <-> '.join(value) + ')')
+        elif kind == 'prefix':
+            parts.append(f'{value}:*')
+        else:
+            parts.append(value)
+    return ' & '.join(parts)
+
+
+def _contains_query(terms):
+    parts = []
+    for kind, value in terms:
+        if kind == 'phrase':
+            parts.append('"' + ' '.join(value) + '"')
+        elif kind == 'prefix':
+            parts.append(f'"{value}*"')
+        else:
+            parts.append(f'"{value}"')
+    return ' AND '.join(parts)
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def ensure_search_index():
+    """Create the full-text index where the app can do it itself (SQLite FTS5, PostgreSQL GIN)
+
+    SQL Server full-text catalogs can't be created inside a transaction; see
+    schema-sqlserver.sql for the one-time setup.
+    """
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        exists = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        )).first()
+        if not exists:
+            for statement in _SQLITE_SETUP:
+                db.session.execute(text(statement))
+            db.session.commit()
+            print("Full-text search index created")
+    elif dialect == 'postgresql':
+        db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS idx_articles_fts ON articles USING GIN ({_POSTGRES_DOCUMENT})"
+        ))
+        db.session.commit()
+
+
+def _has_mssql_fulltext():
+    global _mssql_fulltext
+    if _mssql_fulltext is None:
+        try:
+            value = db.session.execute(text(
+                "SELECT OBJECTPROPERTY(OBJECT_ID('articles'), 'TableHasActiveFulltextIndex')"
+            )).scalar()
+            _mssql_fulltext = bool(value)
+        except Exception as e:
+            print(f"Full-text index check failed: {e}")
+            _mssql_fulltext = False
+    return _mssql_fulltext
+
+
+def match_subquery(query):
+    """Return a subquery of (article_id, rank) for articles whose text matches, higher rank first
+
+    Returns None when the query has no searchable words or the database has no
+    full-text index, in which case callers should fall back to like_filter().
+    """
+    terms = parse_query(query)
+    if not terms:
+        return None
+
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        # bm25() is lower-is-better; title hits weigh more than description hits
+        statement = text(
+            "SELECT rowid AS article_id, -bm25(articles_fts, 5.0, 1.0) AS rank "
+            "FROM articles_fts WHERE articles_fts MATCH :match"
+        ).bindparams(match=_fts5_query(terms))
+    elif dialect == 'postgresql':
+        statement = text(
+            f"SELECT id AS article_id, ts_rank({_POSTGRES_DOCUMENT}, query) AS rank "
+            f"FROM articles, to_tsquery('english', :match) query "
+            f"WHERE {_POSTGRES_DOCUMENT} @@ query"
+        ).bindparams(match=_tsquery(terms))
+    elif dialect == 'mssql' and _has_mssql_fulltext():
+        statement = text(
+            "SELECT [KEY] AS article_id, RANK AS rank "
+            "FROM CONTAINSTABLE(articles, (title, description), :match)"
+        ).bindparams(match=_contains_query(terms))
+    else:
+        return None
+
+    return statement.columns(article_id=Integer, rank=Float).subquery('search_matches')
+
+
+def matching_feed_ids(query):
+    """Get ids of feeds whose name matches every term of the query"""
+    terms = parse_query(query)
+    if not terms:
+        return []
+
+    matches = []
+    for feed_id, name in db.session.query(Feed.id, Feed.name):
+        words = _WORD_RE.findall((name or '').lower())
+        joined = ' '.join(words)
+        if all(_term_matches(kind, value, words, joined) for kind, value in terms):
+            matches.append(feed_id)
+    return matches
+
+
+def _term_matches(kind, value, words, joined):
+    if kind == 'phrase':
+        return ' '.join(value) in joined
+    if kind == 'prefix':
+        return any(word.startswith(value) for word in words)
+    return value in words
+
+
+def like_filter(query):
+    """Substring filter over title, description and feed name for databases without full-text search"""
+    pattern = f'%{query.lower()}%'
+    columns = [Article.title, Article.description, Feed.name]
+    if _dialect() == 'mssql':
+        # NTEXT columns can't be passed to LOWER(); the default collation is case-insensitive anyway
+        return db.or_(*[column.like(pattern) for column in columns])
+    return db.or_(*[db.func.lower(column).like(pattern) for column in columns])
@@ -0,0 +1,110 @@
+"""
+Feed timestamp parsing
+Fast paths for RFC 822 (RSS pubDate) and RFC 3339 (Atom published/updated) with a dateutil fallback,
+memoized because a feed repeats the same few date strings on every fetch
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from dateutil import parser as date_parser
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# UTC offsets in minutes for zone names seen in RSS feeds (RFC 822 names plus common extras)
+ZONES = {
+    'ut': 0, 'utc': 0, 'gmt': 0, 'z': 0,
+    'est': -300, 'edt': -240, 'cst': -360, 'cdt': -300,
+    'mst': -420, 'mdt': -360, 'pst': -480, 'pdt': -420,
+    'akst': -540, 'akdt': -480, 'hst': -600,
+    'bst': 60, 'cet': 60, 'cest': 120, 'eet': 120, 'eest': 180,
+    'ist': 330, 'sgt': 480, 'hkt': 480, 'jst': 540, 'kst': 540,
+    'aest': 600, 'aedt': 660, 'nzst': 720, 'nzdt': 780
+}
+
+# e.g. "Mon, 01 Sep 2025 10:15:00 GMT", "1 Sep 25 10:15 +0100"
+_RFC822_RE = re.compile(
+    r'^\s*(?:[A-Za-z]+,?\s*)?(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\.?\s+(\d{2,4})'
+    r'\s+(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:([+-])(\d{2}):?(\d{2})|([A-Za-z]{1,5}))?\s*$'
+)
+
+# e.g. "2025-09-01T10:15:00Z", "2025-09-01T10:15:00.123+01:00", "2025-09-01"
+_RFC3339_RE = re.compile(
+    r'^\s*(\d{4})-(\d{2})-(\d{2})(?:[Tt ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?)?'
+    r'\s*(?:([Zz])|([+-])(\d{2}):?(\d{2}))?\s*$'
+)
+
+_DATEUTIL_TZINFOS = {name.upper(): offset * 60 for name, offset in ZONES.items()}
+
+
+def _to_naive_utc(year, month, day, hour, minute, second, microsecond, offset_minutes):
+    value = datetime(year, month, day, hour, minute, second, microsecond)
+    return value - timedelta(minutes=offset_minutes)
+
+
+def _parse_rfc822(value):
+    match = _RFC822_RE.match(value)
+    if not match:
+        return None
+    day, month_name, year, hour, minute, second, sign, off_h, off_m, zone = match.groups()
+    month = MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+
+    if sign:
+        offset = int(off_h) * 60 + int(off_m)
+        if sign == '-':
+            offset = -offset
+    elif zone:
+        offset = ZONES.get(zone.lower())
+        if offset is None:
+            return None
+    else:
+        offset = 0
+
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+    return _to_naive_utc(year, month, int(day), int(hour), int(minute), int(second or 0), 0, offset)
+
+
+def _parse_rfc3339(value):
+    match = _RFC3339_RE.match(value)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction, utc, sign, off_h, off_m = match.groups()
+
+    offset = 0
+    if sign:
+        offset = int(off_h) * 60 + int(off_m)
+        if sign == '-':
+            offset = -offset
+    microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+    return _to_naive_utc(int(year), int(month), int(day), int(hour or 0), int(minute or 0),
+                         int(second or 0), microsecond, offset)
+
+
+def _parse_fallback(value):
+    published_dt = date_parser.parse(value, tzinfos=_DATEUTIL_TZINFOS)
+    if published_dt.tzinfo is not None:
+        published_dt = published_dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return published_dt
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(value):
+    """Parse a feed date string to a naive UTC datetime, or None if it can't be parsed"""
+    if not value:
+        return None
+    try:
+        parsed = _parse_rfc3339(value) if value.lstrip()[:1].isdigit() and '-' in value[:8] else None
+        if parsed is None:
+            parsed = _parse_rfc822(value)
+        if parsed is None:
+            parsed = _parse_fallback(value)
+        return parsed
+    except (ValueError, OverflowError, TypeError):
+        return None